@@ -0,0 +1,697 @@
+import calendar
+import codecs
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+from pandas.api.types import union_categoricals
+
+import activity_rollup
+import instrumentation
+
+ACTIVITY_URL = "https://data.cmiles.info/anonymousActivityData.json"
+
+DEFAULT_CACHE_DIR = os.environ.get("ACTIVITY_CACHE_DIR", ".activity_cache")
+DEFAULT_CACHE_TTL_SECONDS = float(os.environ.get("ACTIVITY_CACHE_TTL", 15 * 60))
+DEFAULT_SNAPSHOT_DIR = os.environ.get("ACTIVITY_SNAPSHOT_DIR", os.path.join(DEFAULT_CACHE_DIR, "snapshots"))
+
+# Fields of a feed record used by the dashboard
+FEED_COLUMNS = ("folder", "activityType", "start", "end", "distanceMiles", "climbFeet")
+FEED_CHUNK_BYTES = 1 << 20
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+# Bump when prepare_activities changes so older snapshots are not reused
+PREPARE_VERSION = 2
+
+
+def _cache_paths(cache_dir: str | os.PathLike) -> tuple[Path, Path]:
+    cache_dir = Path(cache_dir)
+    return cache_dir / "anonymousActivityData.json", cache_dir / "anonymousActivityData.meta.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Unique per process and thread, so concurrent writers never share a temp file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _read_meta(meta_path: Path) -> dict:
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+@instrumentation.instrumented("activity/download", rows=None)
+def fetch_activity_file(url: str = ACTIVITY_URL,
+                        cache_dir: str | os.PathLike = DEFAULT_CACHE_DIR,
+                        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+                        *, session: requests.Session | None = None,
+                        timeout: float = 30) -> Path:
+    """
+    Return the path of the on-disk copy of the activity feed, refreshing it first
+    if needed. The body is streamed to disk, never held in memory as a whole.
+
+    - A cached copy younger than ttl_seconds is returned without touching the network.
+    - An older copy is revalidated with a conditional GET (If-None-Match /
+      If-Modified-Since from the stored ETag / Last-Modified); a 304 keeps the
+      cached body and restarts the TTL.
+    - If the request fails (offline, timeout, server error) and a cached copy
+      exists, the cached copy is returned regardless of age.
+
+    The body's sha256 is recorded in the metadata while it streams in, so
+    feed_key of an unchanged copy needs no re-read of the file.
+
+    ttl_seconds=0 always revalidates; the cache directory is created on first use.
+    """
+    body_path, meta_path = _cache_paths(cache_dir)
+    meta = _read_meta(meta_path) if body_path.exists() else {}
+    if meta.get("url") != url:
+        meta = {}
+
+    if meta and time.time() - meta.get("fetched_at", 0) < ttl_seconds:
+        return body_path
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    http = session or requests
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    # A unique temp file per download: fetchers sharing cache_dir (threads, processes) never mix bodies
+    with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=body_path.name + ".", suffix=".download",
+                                     delete=False) as f:
+        tmp = Path(f.name)
+    digest = hashlib.sha256()
+    try:
+        with http.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code != 304:
+                response.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=FEED_CHUNK_BYTES):
+                        f.write(chunk)
+                        digest.update(chunk)
+    except requests.RequestException:
+        tmp.unlink(missing_ok=True)
+        if meta:
+            return body_path
+        raise
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    if response.status_code == 304:
+        tmp.unlink(missing_ok=True)
+    else:
+        os.replace(tmp, body_path)
+        stat = body_path.stat()
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest.hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    meta["fetched_at"] = time.time()
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return body_path
+
+
+def fetch_activity_json(url: str = ACTIVITY_URL,
+                        cache_dir: str | os.PathLike = DEFAULT_CACHE_DIR,
+                        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+                        *, session: requests.Session | None = None,
+                        timeout: float = 30) -> str:
+    """The activity feed body as text, cached as described in fetch_activity_file."""
+    path = fetch_activity_file(url, cache_dir, ttl_seconds, session=session, timeout=timeout)
+    return path.read_text(encoding="utf-8")
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array read from a stream of UTF-8
+    byte chunks, decoding one element at a time.
+
+    >>> list(iter_json_array([b'[{"a": 1}, {"a"', b': 2}]']))
+    [{'a': 1}, {'a': 2}]
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, opened = "", 0, False
+    for chunk in chunks:
+        buf = buf[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _JSON_SEPARATORS.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array of activity records.")
+                opened, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            yield item
+    raise ValueError("Truncated or malformed JSON array.")
+
+
+def iter_file_chunks(path: str | os.PathLike, chunk_bytes: int | None = None, start: int = 0,
+                     stop: int | None = None) -> Iterator[bytes]:
+    """Read a file (bytes start to stop, default all of it) as a stream of byte chunks."""
+    chunk_bytes = chunk_bytes or FEED_CHUNK_BYTES
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = float("inf") if stop is None else stop - start
+        while remaining > 0 and (chunk := f.read(int(min(chunk_bytes, remaining)))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _starts_since(since: pd.Timestamp) -> Callable[[object], bool]:
+    """Test of a record's raw start value: is it since or later? (missing starts are not)"""
+    since_py = since.to_pydatetime()
+
+    def test(value) -> bool:
+        try:
+            return datetime.fromisoformat(value) >= since_py
+        except (TypeError, ValueError):
+            start = pd.to_datetime(value, errors="coerce")
+            return pd.notna(start) and start >= since
+
+    return test
+
+
+def read_activity_stream(chunks: Iterable[bytes], activity_type: str | None = "On Foot",
+                         columns: tuple[str, ...] = FEED_COLUMNS,
+                         batch_size: int = 50_000, since: pd.Timestamp | None = None) -> pd.DataFrame:
+    """
+    Build a raw feed DataFrame from a streamed JSON array, keeping only records of
+    activity_type (None keeps all) and only the given columns. Records are
+    converted in batches into typed columns (datetime64 start/end, int64 or
+    float64 metrics as pd.read_json would infer them, categorical
+    folder/activityType), so neither the whole payload nor
+    the discarded records are ever held in memory. With since, records starting
+    before it are skipped as they are parsed, before any conversion.
+    """
+    parts: dict[str, list] = {name: [] for name in columns}
+    batch: dict[str, list] = {name: [] for name in columns}
+    recent = _starts_since(pd.Timestamp(since)) if since is not None else None
+
+    def flush():
+        for name, values in batch.items():
+            if name in ("start", "end"):
+                typed = pd.to_datetime(pd.Series(values, dtype=object))
+            elif name in ("distanceMiles", "climbFeet"):
+                typed = pd.to_numeric(pd.Series(values, dtype=object))
+            elif name in ("folder", "activityType"):
+                typed = pd.Series(pd.Categorical(values))
+            else:
+                typed = pd.Series(values, dtype=object)
+            parts[name].append(typed)
+            values.clear()
+
+    pending = 0
+    for record in iter_json_array(chunks):
+        if activity_type is not None and record.get("activityType") != activity_type:
+            continue
+        if recent is not None and not recent(record.get("start")):
+            continue
+        for name in columns:
+            batch[name].append(record.get(name))
+        pending += 1
+        if pending == batch_size:
+            flush()
+            pending = 0
+    if pending or not parts[columns[0]]:
+        flush()
+
+    data = {}
+    for name, pieces in parts.items():
+        if isinstance(pieces[0].dtype, pd.CategoricalDtype):
+            data[name] = union_categoricals(pieces, sort_categories=True)
+        else:
+            data[name] = pd.concat(pieces, ignore_index=True)
+    for name in ("distanceMiles", "climbFeet"):
+        if name in data:
+            data[name] = _as_read_json_number(data[name])
+    return pd.DataFrame(data)
+
+
+def _as_read_json_number(column: pd.Series) -> pd.Series:
+    """
+    The dtype pd.read_json infers for a numeric column: int64 when every value
+    is a whole number that fits (even if written as 1.0), else float64.
+
+    >>> _as_read_json_number(pd.Series([1.0, 2.0])).dtype, _as_read_json_number(pd.Series([1.0, None])).dtype
+    (dtype('int64'), dtype('float64'))
+    """
+    values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    if len(values) and np.isfinite(values).all() and (np.abs(values) < 2 ** 63).all() \
+            and (values == np.round(values)).all():
+        return pd.Series(values.astype(np.int64), name=column.name)
+    return pd.Series(values, name=column.name)
+
+
+@instrumentation.instrumented("activity/prepare")
+def prepare_activities(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep the On Foot activities of a raw feed DataFrame and add the derived columns
+    used by the dashboard (folder/activityType categoricals, startYear,
+    durationMinutes, startMonth, startMonthDateTime, startWeekday, startHour).
+    """
+    lines = raw.query('activityType == "On Foot"').copy()
+
+    lines['folder'] = pd.Categorical(lines['folder'].astype(str))
+    lines['activityType'] = pd.Categorical(lines['activityType'])
+
+    lines['start'] = pd.to_datetime(lines['start'])
+    lines['end'] = pd.to_datetime(lines['end'])
+
+    startYearRange = range(lines['start'].min().year, lines['start'].max().year + 1)
+    lines['startYear'] = pd.Categorical(lines['start'].dt.year, categories=startYearRange, ordered=True)
+
+    lines['durationMinutes'] = (lines['end'].subtract(lines['start']).dt.total_seconds() / 60).round(0)
+
+    lines['startMonth'] = pd.Categorical(lines['start'].dt.month_name(), categories=list(calendar.month_name)[1:], ordered=True)
+    lines['startMonthDateTime'] = lines['start'].values.astype('datetime64[M]')
+    lines['startWeekday'] = pd.Categorical(lines['start'].dt.day_name(), categories=list(calendar.day_name), ordered=True)
+    lines['startHour'] = pd.Categorical(lines['start'].dt.hour, categories=range(0,25), ordered=True)
+
+    return lines
+
+
+def payload_key(activity_json: str) -> str:
+    """Snapshot key for a feed payload: hash of the payload and the prepare version."""
+    digest = hashlib.sha256(activity_json.encode("utf-8"))
+    digest.update(f"prepare-v{PREPARE_VERSION}".encode())
+    return digest.hexdigest()[:32]
+
+
+def file_digest(path: str | os.PathLike) -> str:
+    """
+    sha256 of a feed file. A copy kept by fetch_activity_file is not re-read:
+    its digest comes from the metadata next to it, as long as that still
+    describes the file (same size and modification time).
+    """
+    path = Path(path)
+    meta = _read_meta(path.with_suffix(".meta.json"))
+    stat = path.stat()
+    if meta.get("sha256") and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+        return meta["sha256"]
+    digest = hashlib.sha256()
+    for chunk in iter_file_chunks(path):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def feed_key(feed: str | os.PathLike) -> str:
+    """Snapshot key of a feed given as text (payload_key) or as a path to the (UTF-8) feed file."""
+    if isinstance(feed, str):
+        return payload_key(feed)
+    digest = hashlib.sha256(file_digest(feed).encode())
+    digest.update(f"prepare-v{PREPARE_VERSION}".encode())
+    return digest.hexdigest()[:32]
+
+
+def feed_prefix(path: str | os.PathLike) -> dict:
+    """
+    Length and sha256 of a feed file's bytes up to its last element (all but
+    the closing ']' and the whitespace around it), for appended_records. Empty
+    if the file does not end like a JSON array.
+    """
+    size = Path(path).stat().st_size
+    with open(path, "rb") as f:
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+    body = tail.rstrip()
+    if not body.endswith(b"]"):
+        return {}
+    length = size - len(tail) + len(body[:-1].rstrip())
+    digest = hashlib.sha256()
+    for chunk in iter_file_chunks(path, stop=length):
+        digest.update(chunk)
+    return {"bytes": length, "sha256": digest.hexdigest()}
+
+
+def appended_records(path: str | os.PathLike, prefix: dict) -> int | None:
+    """
+    If the feed file still starts with the bytes described by prefix (from
+    feed_prefix of an earlier version), i.e. records were only appended, the
+    byte offset where the new records begin; otherwise None.
+    """
+    length = prefix.get("bytes")
+    if not length or Path(path).stat().st_size <= length:
+        return None
+    digest = hashlib.sha256()
+    for chunk in iter_file_chunks(path, stop=length):
+        digest.update(chunk)
+    return length if digest.hexdigest() == prefix.get("sha256") else None
+
+
+@instrumentation.instrumented("activity/read_json")
+def read_feed(feed: str | os.PathLike, since: pd.Timestamp | None = None, offset: int = 0) -> pd.DataFrame:
+    """
+    Raw feed DataFrame (FEED_COLUMNS only) from the feed text (pd.read_json) or
+    from a path to the feed file (streamed with read_activity_stream, On Foot
+    records only). since leaves out records starting before it; the stream
+    skips them unconverted. offset (files only, e.g. from appended_records)
+    starts reading at an element boundary, so the records before it are not
+    even decoded.
+    """
+    if not isinstance(feed, str):
+        chunks = iter_file_chunks(feed, start=offset)
+        return read_activity_stream(itertools.chain([b"["], chunks) if offset else chunks, since=since)
+    # Projected like the stream, so both paths prepare the same columns
+    raw = pd.read_json(StringIO(feed)).reindex(columns=list(FEED_COLUMNS))
+    if since is not None:
+        raw = raw[(pd.to_datetime(raw['start']) >= since).to_numpy()]
+    return raw
+
+
+@instrumentation.instrumented("activity/write_snapshot", rows=None)
+def write_snapshot(lines: pd.DataFrame, snapshot_dir: str | os.PathLike, key: str) -> Path:
+    """
+    Persist a prepared DataFrame as one .npy file per column plus a columns.json
+    schema (categoricals are stored as codes + categories, other object/string
+    columns as factorized codes + uniques). Older snapshots in snapshot_dir are
+    removed once the new one is in place.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    target = snapshot_dir / key
+    tmp = snapshot_dir / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    schema = {"version": PREPARE_VERSION, "columns": []}
+    np.save(tmp / "__index__.npy", lines.index.to_numpy())
+    for i, name in enumerate(lines.columns):
+        col = lines[name]
+        entry = {"name": name, "file": f"{i}.npy"}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            entry.update(kind="categorical", categories=col.cat.categories.tolist(), ordered=bool(col.cat.ordered))
+            np.save(tmp / entry["file"], col.cat.codes.to_numpy())
+        elif col.dtype.kind in "OUT" or isinstance(col.dtype, pd.StringDtype):
+            codes, uniques = pd.factorize(col)
+            entry.update(kind="factorized", uniques=list(uniques), dtype=str(col.dtype))
+            np.save(tmp / entry["file"], codes)
+        else:
+            entry.update(kind="array")
+            np.save(tmp / entry["file"], col.to_numpy())
+        schema["columns"].append(entry)
+    (tmp / "columns.json").write_text(json.dumps(schema))
+
+    if target.exists():
+        shutil.rmtree(tmp)
+    else:
+        os.replace(tmp, target)
+    for old in snapshot_dir.iterdir():
+        if old.is_dir() and old.name != key and not old.name.startswith("."):
+            shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+@instrumentation.instrumented("activity/read_snapshot")
+def read_snapshot(snapshot_dir: str | os.PathLike, key: str) -> pd.DataFrame | None:
+    """
+    Load a snapshot written by write_snapshot, memory-mapping the numeric and
+    datetime columns (and categorical codes) copy-on-write, so in-place edits
+    stay private to the process. Returns None if there is no snapshot for key.
+    """
+    path = Path(snapshot_dir) / key
+    try:
+        schema = json.loads((path / "columns.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if schema.get("version") != PREPARE_VERSION:
+        return None
+
+    # np.asarray drops the np.memmap subclass but keeps the mapped buffer
+    index = pd.Index(np.asarray(np.load(path / "__index__.npy", mmap_mode="c")))
+    columns = {}
+    for entry in schema["columns"]:
+        values = np.asarray(np.load(path / entry["file"], mmap_mode="c"))
+        if entry["kind"] == "categorical":
+            dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+            columns[entry["name"]] = pd.Categorical.from_codes(values, dtype=dtype)
+        elif entry["kind"] == "factorized":
+            uniques = pd.array(entry["uniques"], dtype=entry["dtype"])
+            columns[entry["name"]] = uniques.take(values, allow_fill=True)
+        else:
+            columns[entry["name"]] = values
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def load_prepared_activities(activity_json: str | os.PathLike,
+                             snapshot_dir: str | os.PathLike | None = DEFAULT_SNAPSHOT_DIR) -> pd.DataFrame:
+    """
+    Prepared activity table for a feed payload (text or path, see read_feed). A
+    snapshot keyed by the payload hash is reused when present; otherwise the
+    JSON is parsed, prepared and snapshotted for the next process.
+    snapshot_dir=None disables snapshots.
+    """
+    if snapshot_dir is None:
+        return prepare_activities(read_feed(activity_json))
+
+    key = feed_key(activity_json)
+    lines = read_snapshot(snapshot_dir, key)
+    if lines is None:
+        lines = prepare_activities(read_feed(activity_json))
+        write_snapshot(lines, snapshot_dir, key)
+    return lines
+
+
+DEFAULT_STORE_DIR = os.environ.get("ACTIVITY_STORE_DIR", os.path.join(DEFAULT_CACHE_DIR, "store"))
+
+# How far back a full feed download may revise already stored activities
+DEFAULT_REFRESH_OVERLAP = pd.Timedelta(days=14)
+
+ROLLUP_COLUMNS = [name for name, _ in activity_rollup.ROLLUP_METRICS]
+
+
+def _union_categoricals(lines: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """Align the categorical columns of delta and lines on the union of their categories."""
+    for name in lines.columns:
+        old, new = lines[name], delta[name]
+        if not isinstance(old.dtype, pd.CategoricalDtype) or old.dtype == new.dtype:
+            continue
+        if name == 'startYear':
+            years = [*old.cat.categories, *new.cat.categories]
+            categories = range(min(years), max(years) + 1)
+        else:
+            categories = sorted(set(old.cat.categories) | set(new.cat.categories))
+        dtype = pd.CategoricalDtype(categories, ordered=old.cat.ordered)
+        lines[name] = old.astype(dtype)
+        delta[name] = new.astype(dtype)
+    return delta
+
+
+def refresh_cutoff(lines: pd.DataFrame, overlap: pd.Timedelta | None = None,
+                   last_start: pd.Timestamp | None = None) -> pd.Timestamp | None:
+    """
+    Start from which incoming rows are merged into lines (sorted by start):
+    last_start (default: the last stored start), minus overlap when given;
+    None for an empty table.
+    """
+    if not len(lines):
+        return None
+    if last_start is None:
+        last_start = lines['start'].iloc[-1]
+    return last_start if overlap is None else last_start - overlap
+
+
+@instrumentation.instrumented("activity/merge_new", rows=lambda result: len(result[0]))
+def merge_new_activities(lines: pd.DataFrame, rollup: activity_rollup.DailyRollup, raw_new: pd.DataFrame,
+                         overlap: pd.Timedelta | None = None, *, insert: bool = False,
+                         last_start: pd.Timestamp | None = None) -> tuple[pd.DataFrame, activity_rollup.DailyRollup]:
+    """
+    Merge raw feed rows into a prepared table sorted by start and its
+    (ungrouped) DailyRollup, deriving columns only for the incoming rows and
+    recomputing the rollup only from the first day they touch.
+
+    overlap=None appends the rows of raw_new that start after the last stored
+    activity (a delta file). With a Timedelta, raw_new is treated as
+    authoritative from (last stored start - overlap) on: stored rows from that
+    point are replaced by the incoming ones, so edits to recent activities are
+    picked up without duplicating them. insert=True keeps every stored row and
+    merges all of raw_new in by start (records appended to the feed, whatever
+    their start). last_start replaces the last stored start in the cutoff,
+    e.g. the newest start the feed supplied when lines also holds rows
+    appended from a delta file.
+    """
+    raw_start = pd.to_datetime(raw_new['start'])
+    cutoff = refresh_cutoff(lines, overlap, last_start)
+
+    if cutoff is None or insert:
+        keep_rows = len(lines)
+    elif overlap is None:
+        keep_rows = len(lines)
+        raw_new = raw_new[(raw_start > cutoff).to_numpy()]
+    else:
+        keep_rows = int(np.searchsorted(lines['start'].to_numpy(), cutoff.to_datetime64(), side="left"))
+        raw_new = raw_new[(raw_start >= cutoff).to_numpy()]
+
+    removed = lines.iloc[keep_rows:]
+    delta = raw_new.loc[raw_new['activityType'] == "On Foot"]
+    if delta.empty and removed.empty:
+        return lines, rollup
+
+    kept = lines.iloc[:keep_rows].copy()
+    if not delta.empty:
+        delta = prepare_activities(delta).sort_values('start', kind="stable")
+        next_index = int(lines.index.max()) + 1 if len(lines) else 0
+        delta.index = pd.RangeIndex(next_index, next_index + len(delta))
+        if len(kept):
+            delta = _union_categoricals(kept, delta.reindex(columns=kept.columns))
+        merged = pd.concat([kept, delta]) if len(kept) else delta
+        if insert and len(kept) and delta['start'].min() < kept['start'].iloc[-1]:
+            merged = merged.sort_values('start', kind="stable")
+    else:
+        merged = kept
+
+    # Only the days from the first removed or added row on are re-aggregated, from their slice of the sorted table
+    first_start = min(frame['start'].min() for frame in (removed, delta) if len(frame))
+    since = np.datetime64(first_start, "D")
+    starts = merged['start'].to_numpy()
+    tail = merged.iloc[int(np.searchsorted(starts, since.astype(starts.dtype), side="left")):]
+    return merged, rollup.with_tail(tail, since)
+
+
+def _rollup_frame(rollup: activity_rollup.DailyRollup) -> pd.DataFrame:
+    return pd.DataFrame(rollup.cumulative[:, 0, :], columns=ROLLUP_COLUMNS)
+
+
+def _read_store(store_dir: Path) -> tuple[dict, pd.DataFrame, activity_rollup.DailyRollup] | None:
+    try:
+        meta = json.loads((store_dir / "store.json").read_text())
+    except (OSError, ValueError):
+        return None
+    lines = read_snapshot(store_dir / "lines", meta["generation"])
+    cumulative = read_snapshot(store_dir / "rollup", meta["generation"])
+    if lines is None or cumulative is None or "first_day" not in meta:
+        return None
+    rollup = activity_rollup.DailyRollup(np.datetime64(meta["first_day"], "D"),
+                                         cumulative[ROLLUP_COLUMNS].to_numpy()[:, None, :])
+    return meta, lines, rollup
+
+
+def _write_store(store_dir: Path, meta: dict, lines: pd.DataFrame, rollup: activity_rollup.DailyRollup) -> None:
+    generation = f"{int(meta.get('generation', '0')) + 1:08d}"
+    write_snapshot(lines, store_dir / "lines", generation)
+    write_snapshot(_rollup_frame(rollup), store_dir / "rollup", generation)
+    meta = {**meta, "generation": generation, "first_day": str(rollup.first_day)}
+    _write_atomic(store_dir / "store.json", json.dumps(meta).encode("utf-8"))
+
+
+def save_activity_store(store_dir: str | os.PathLike, lines: pd.DataFrame, rollup: activity_rollup.DailyRollup) -> None:
+    """
+    Write lines and their (ungrouped) rollup as a new store in store_dir, e.g.
+    to hand one loaded version of the data to another process. That process
+    reads it back with load_incremental_activities(store_dir=store_dir): with no
+    feed given, nothing is fetched, merged or rewritten.
+    """
+    _write_store(Path(store_dir), {}, lines, rollup)
+
+
+@instrumentation.instrumented("activity/load_incremental", rows=lambda result: len(result[0]))
+def load_incremental_activities(activity_json: str | os.PathLike | None = None, delta_json: str | None = None,
+                                store_dir: str | os.PathLike = DEFAULT_STORE_DIR,
+                                overlap: pd.Timedelta = DEFAULT_REFRESH_OVERLAP
+                                ) -> tuple[pd.DataFrame, activity_rollup.DailyRollup]:
+    """
+    Prepared activity table (sorted by start) and its DailyRollup, kept in a
+    local store and updated incrementally.
+
+    - activity_json: full feed payload (text, or a path to stream it from). If it is the payload the store was last
+      built from, the store is used as is (for a file kept by fetch_activity_file
+      that check reads only its metadata). If the file only gained records
+      after the ones stored (see appended_records), just those are decoded and
+      inserted. Otherwise only activities from (last stored start - overlap)
+      on are converted, derived and merged. The rollup is recomputed from the
+      first day the new rows touch.
+    - delta_json: a JSON array of new activities (e.g. a local delta file);
+      records starting after the last stored activity are appended. The feed
+      overlap is measured from the newest activity the feed itself supplied
+      (feed_last_start in store.json), so feed records older than delta rows
+      are still picked up once the feed has them; delta rows newer than the
+      feed are appended again after each feed merge.
+
+    The store is created from activity_json on first use.
+    """
+    store_dir = Path(store_dir)
+    store = _read_store(store_dir)
+
+    if store is None:
+        if activity_json is None:
+            raise ValueError("An empty activity store needs the full activity_json to start from.")
+        lines = prepare_activities(read_feed(activity_json)).sort_values('start', kind="stable")
+        meta, rollup = {"source_key": feed_key(activity_json)}, activity_rollup.DailyRollup.from_lines(lines)
+        if len(lines):
+            meta["feed_last_start"] = str(lines['start'].max())
+        changed = True
+    else:
+        meta, lines, rollup = store
+        changed = False
+        # The overlap is measured from the newest activity the feed supplied, not from delta file rows
+        feed_last_start = pd.Timestamp(meta["feed_last_start"]) if "feed_last_start" in meta else None
+        source_key = feed_key(activity_json) if activity_json is not None else None
+        if source_key is not None and source_key != meta.get("source_key"):
+            offset = None
+            if not isinstance(activity_json, str) and meta.get("source_prefix"):
+                offset = appended_records(activity_json, meta["source_prefix"])
+            if offset is not None:
+                # Only records were appended: decode just those and insert them
+                raw_new = read_feed(activity_json, offset=offset)
+                lines, rollup = merge_new_activities(lines, rollup, raw_new, insert=True)
+                newest = [feed_last_start, pd.to_datetime(raw_new['start']).max()]
+            else:
+                cutoff = refresh_cutoff(lines, overlap, feed_last_start)
+                raw_new = read_feed(activity_json, since=cutoff)
+                lines, rollup = merge_new_activities(lines, rollup, raw_new, overlap, last_start=feed_last_start)
+                newest = [cutoff, pd.to_datetime(raw_new['start']).max()]
+            newest = [start for start in newest if start is not None and not pd.isna(start)]
+            if newest:
+                meta["feed_last_start"] = str(max(newest))
+            meta["source_key"] = source_key
+            changed = True
+
+    if delta_json is not None:
+        delta_key = payload_key(delta_json)
+        # A feed merge replaces the stored rows after its cutoff, delta rows included: append them again
+        if delta_key != meta.get("delta_key") or (changed and store is not None):
+            lines, rollup = merge_new_activities(lines, rollup, pd.read_json(StringIO(delta_json)))
+            meta["delta_key"] = delta_key
+            changed = True
+
+    if changed:
+        # Rows merged from a delta file may reappear among records appended to the feed, so such
+        # stores always go through the overlap merge
+        if isinstance(activity_json, (str, type(None))) or "delta_key" in meta:
+            meta.pop("source_prefix", None)
+        else:
+            meta["source_prefix"] = feed_prefix(activity_json)
+        _write_store(store_dir, meta, lines, rollup)
+    return lines, rollup
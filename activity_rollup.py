@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+# (output column, lines column or None for the activity count)
+ROLLUP_METRICS = (
+    ("totalDistanceMiles", "distanceMiles"),
+    ("totalActivities", None),
+    ("totalDurationMinutes", "durationMinutes"),
+    ("totalClimbFeet", "climbFeet"),
+)
+# Column labels of the Year x Month pivots
+MONTH_ORDER = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class DailyRollup:
+    """
+    Per-day totals (distance, activity count, duration, climb) of a prepared
+    activity table, optionally split by a group column such as folder, stored as
+    prefix sums so any [first day, last day] window costs two lookups.
+
+    Activities are assigned to the (wall-clock) day of their start. Unlike
+    date_tools.filter_in_ranges, an activity counts towards every window that
+    contains it, so overlapping windows each see it.
+
+    >>> lines = pd.DataFrame({
+    ...     "start": pd.to_datetime(["2024-10-01 08:00", "2024-10-02 09:00", "2024-11-05 07:00"]),
+    ...     "distanceMiles": [3.0, 5.0, 4.0], "durationMinutes": [60.0, 90.0, 70.0],
+    ...     "climbFeet": [100, 300, 200], "folder": ["2024", "2024", "2024"]})
+    >>> rollup = DailyRollup.from_lines(lines)
+    >>> rollup.windows([("2024-10-02", "2024-11-30"), ("2024-10-01", "2024-10-01")]).iloc[:, :4]
+      matchStart   matchEnd  totalDistanceMiles  totalActivities
+    0 2024-10-02 2024-11-30                 9.0                2
+    1 2024-10-01 2024-10-01                 3.0                1
+    >>> rollup.monthly()[["startMonthDateTime", "totalDistanceMiles", "totalActivities"]]
+      startMonthDateTime  totalDistanceMiles  totalActivities
+    0         2024-10-01                 8.0                2
+    1         2024-11-01                 4.0                1
+    >>> empty = DailyRollup.from_lines(lines.iloc[:0])
+    >>> empty.n_days, len(empty.monthly()), empty.windows([("2024-10-01", "2024-10-31")])["totalActivities"].tolist()
+    (0, 0, [0])
+    """
+
+    def __init__(self, first_day: np.datetime64, cumulative: np.ndarray, groups: pd.Index | None = None,
+                 group_name: str | None = None):
+        # cumulative[i] = totals of all days before first_day + i; shape (days + 1, groups, metrics)
+        self.first_day = np.datetime64(first_day, "D")
+        self.cumulative = cumulative
+        self.groups = groups
+        self.group_name = group_name
+
+    @classmethod
+    @instrumentation.instrumented("rollup/from_lines", rows=lambda rollup: rollup.n_days)
+    def from_lines(cls, lines: pd.DataFrame, by: str | None = None, start_column: str = "start") -> "DailyRollup":
+        """Build the rollup in one pass over lines (by: optional group column, e.g. 'folder')."""
+        starts = lines[start_column]
+        if starts.dt.tz is not None:
+            starts = starts.dt.tz_localize(None)
+        days = starts.to_numpy().astype("datetime64[D]")
+        valid = ~np.isnat(days)
+        days = days[valid]
+
+        if by is None:
+            group_codes, groups = np.zeros(len(days), dtype=np.int64), None
+        else:
+            group_codes, groups = pd.factorize(lines[by].to_numpy()[valid], sort=True)
+            groups = pd.Index(groups, name=by)
+        n_groups = 1 if groups is None else len(groups)
+
+        if len(days):
+            first_day = days.min()
+            day_offsets = (days - first_day).astype(np.int64)
+            n_days = int(day_offsets.max()) + 1
+        else:
+            first_day, day_offsets, n_days = np.datetime64("1970-01-01", "D"), np.array([], dtype=np.int64), 0
+
+        cell = day_offsets * n_groups + group_codes
+        daily = np.zeros((n_days * n_groups, len(ROLLUP_METRICS)), dtype=np.float64)
+        for m, (_, column) in enumerate(ROLLUP_METRICS):
+            weights = None if column is None else lines[column].to_numpy(dtype=np.float64, na_value=0.0)[valid]
+            daily[:, m] = np.bincount(cell, weights=weights, minlength=n_days * n_groups)
+
+        cumulative = np.zeros((n_days + 1, n_groups, len(ROLLUP_METRICS)), dtype=np.float64)
+        np.cumsum(daily.reshape(n_days, n_groups, len(ROLLUP_METRICS)), axis=0, out=cumulative[1:])
+        return cls(first_day, cumulative, groups, by)
+
+    @property
+    def n_days(self) -> int:
+        return self.cumulative.shape[0] - 1
+
+    def with_tail(self, tail: pd.DataFrame, since, start_column: str = "start") -> "DailyRollup":
+        """
+        A new ungrouped rollup that keeps the days before since and recomputes
+        since onwards from tail, which must hold every activity starting on or
+        after since (e.g. the rows an incremental merge replaced or added). Only
+        the tail is binned, so the cost scales with the recent days, not with
+        the whole history.
+
+        >>> lines = pd.DataFrame({
+        ...     "start": pd.to_datetime(["2024-10-01 08:00", "2024-10-02 09:00"]),
+        ...     "distanceMiles": [3.0, 5.0], "durationMinutes": [60.0, 90.0], "climbFeet": [100, 300]})
+        >>> tail = pd.DataFrame({
+        ...     "start": pd.to_datetime(["2024-10-02 09:00", "2024-10-04 07:00"]),
+        ...     "distanceMiles": [6.0, 4.0], "durationMinutes": [95.0, 70.0], "climbFeet": [300, 200]})
+        >>> DailyRollup.from_lines(lines).with_tail(tail, "2024-10-02").monthly()[["totalDistanceMiles", "totalActivities"]]
+           totalDistanceMiles  totalActivities
+        0                13.0                3
+        """
+        if self.groups is not None:
+            raise ValueError("with_tail needs an ungrouped rollup")
+        since = np.datetime64(since, "D")
+        keep = int(np.clip((since - self.first_day).astype(np.int64), 0, self.n_days))
+        if not len(tail):
+            # Everything from since on was removed: the days before it are all that is left
+            return DailyRollup(self.first_day, self.cumulative[:keep + 1].copy())
+        rebuilt = DailyRollup.from_lines(tail, start_column=start_column)
+        if keep == 0:
+            return rebuilt
+
+        # cumulative[keep] (totals before since) carries over the empty days up to the tail and under it
+        offset = int((rebuilt.first_day - self.first_day).astype(np.int64))
+        cumulative = np.empty((offset + rebuilt.n_days + 1, *self.cumulative.shape[1:]), dtype=np.float64)
+        cumulative[:keep + 1] = self.cumulative[:keep + 1]
+        cumulative[keep + 1:offset] = self.cumulative[keep]
+        cumulative[offset:] = self.cumulative[keep] + rebuilt.cumulative
+        return DailyRollup(self.first_day, cumulative)
+
+    def window_totals(self, starts, ends) -> np.ndarray:
+        """
+        Totals for inclusive [start, end] day windows (anything date-like NumPy can
+        cast to datetime64[D]), shape (windows, groups, metrics).
+        """
+        starts = np.asarray(starts, dtype="datetime64[D]")
+        ends = np.asarray(ends, dtype="datetime64[D]")
+        lo = np.clip((starts - self.first_day).astype(np.int64), 0, self.n_days)
+        hi = np.clip((ends - self.first_day).astype(np.int64) + 1, 0, self.n_days)
+        hi = np.maximum(hi, lo)
+        return self.cumulative[hi] - self.cumulative[lo]
+
+    def _frame(self, totals: np.ndarray, keys: dict, drop_empty: bool) -> pd.DataFrame:
+        n_windows, n_groups, _ = totals.shape
+        data = {name: np.repeat(values, n_groups) for name, values in keys.items()}
+        if self.groups is not None:
+            data[self.group_name] = np.tile(self.groups.to_numpy(), n_windows)
+        flat = totals.reshape(n_windows * n_groups, len(ROLLUP_METRICS))
+        for m, (name, column) in enumerate(ROLLUP_METRICS):
+            data[name] = flat[:, m].astype(np.int64) if column is None else flat[:, m]
+        out = pd.DataFrame(data)
+        if drop_empty:
+            out = out[out["totalActivities"] > 0].reset_index(drop=True)
+        return out
+
+    @instrumentation.instrumented("rollup/windows")
+    def windows(self, ranges: list, drop_empty: bool = False) -> pd.DataFrame:
+        """
+        One row of totals per [start, end] range (and group), with the bounds as
+        datetime64 matchStart/matchEnd columns like date_tools.filter_in_ranges.
+        drop_empty leaves out windows without activities.
+        """
+        starts = np.array([lo for lo, _ in ranges], dtype="datetime64[D]")
+        ends = np.array([hi for _, hi in ranges], dtype="datetime64[D]")
+        keys = {"matchStart": starts.astype("datetime64[s]"), "matchEnd": ends.astype("datetime64[s]")}
+        return self._frame(self.window_totals(starts, ends), keys, drop_empty)
+
+    def _calendar_periods(self, unit: str, column: str, drop_empty: bool) -> pd.DataFrame:
+        if self.n_days == 0:
+            periods = np.array([], dtype=f"datetime64[{unit}]")
+        else:
+            last_day = self.first_day + (self.n_days - 1)
+            periods = np.arange(self.first_day.astype(f"datetime64[{unit}]"),
+                                last_day.astype(f"datetime64[{unit}]") + 1)
+        totals = self.window_totals(periods.astype("datetime64[D]"), (periods + 1).astype("datetime64[D]") - 1)
+        return self._frame(totals, {column: periods.astype("datetime64[s]")}, drop_empty)
+
+    @instrumentation.instrumented("rollup/monthly")
+    def monthly(self, drop_empty: bool = True) -> pd.DataFrame:
+        """Totals per calendar month, keyed by startMonthDateTime (the first of the month)."""
+        return self._calendar_periods("M", "startMonthDateTime", drop_empty)
+
+    def yearly(self, drop_empty: bool = True) -> pd.DataFrame:
+        """Totals per calendar year (startYearDateTime = January 1st of the year)."""
+        return self._calendar_periods("Y", "startYearDateTime", drop_empty)
+
+
+def window_summary(rollup: DailyRollup, ranges: list) -> pd.DataFrame:
+    """
+    The windows in ranges that have activities, oldest first (by group, then
+    oldest first, for a grouped rollup): the dashboard's four-week summary, as
+    shown by the notebook, written to the static bundle and compared per
+    athlete by team_data.
+
+    >>> lines = pd.DataFrame({
+    ...     "start": pd.to_datetime(["2023-10-10 08:00", "2024-10-08 09:00"]),
+    ...     "distanceMiles": [3.0, 5.0], "durationMinutes": [60.0, 90.0], "climbFeet": [100, 300]})
+    >>> ranges = [("2024-10-02", "2024-10-15"), ("2023-10-04", "2023-10-17"), ("2022-10-05", "2022-10-18")]
+    >>> window_summary(DailyRollup.from_lines(lines), ranges)[["matchStart", "totalDistanceMiles"]]
+      matchStart  totalDistanceMiles
+    0 2023-10-04                 3.0
+    1 2024-10-02                 5.0
+    """
+    keys = ["matchStart"] if rollup.groups is None else [rollup.group_name, "matchStart"]
+    return rollup.windows(ranges, drop_empty=True).sort_values(keys, kind="stable", ignore_index=True)
+
+
+@instrumentation.instrumented("rollup/monthly_pivot")
+def monthly_pivot(rollup: DailyRollup, first_year: int | pd.Series, end_year: int,
+                  value: str = "totalDistanceMiles") -> pd.DataFrame:
+    """
+    value per Year (rows, first_year to end_year) and month (MONTH_ORDER
+    columns); months without activities are NaN. For a grouped rollup,
+    first_year is a Series of first years by group and the rows are
+    (group, Year).
+
+    >>> lines = pd.DataFrame({
+    ...     "start": pd.to_datetime(["2023-10-10 08:00", "2024-10-08 09:00", "2024-10-20 09:00"]),
+    ...     "distanceMiles": [3.0, 5.0, 2.0], "durationMinutes": [60.0, 90.0, 30.0], "climbFeet": [100, 300, 0]})
+    >>> pivot = monthly_pivot(DailyRollup.from_lines(lines), 2023, 2025)
+    >>> pivot.index.tolist(), pivot["Oct"].tolist(), int(pivot["Sep"].count())
+    ([2023, 2024, 2025], [3.0, 7.0, nan], 0)
+    """
+    months = rollup.monthly()
+    starts = months["startMonthDateTime"].dt
+    months = months.assign(Year=starts.year, Month=np.array(MONTH_ORDER)[starts.month.to_numpy() - 1])
+    if rollup.groups is None:
+        keys, index = ["Year"], pd.RangeIndex(first_year, end_year + 1, name="Year")
+        months = months[months["Year"].between(first_year, end_year)]
+    else:
+        group = rollup.group_name
+        keys = [group, "Year"]
+        index = pd.MultiIndex.from_tuples(
+            [(name, year) for name, first in first_year.items() for year in range(int(first), end_year + 1)],
+            names=keys)
+        months = months[months["Year"].between(months[group].map(first_year).astype(float), end_year)]
+    return (
+        months.pivot_table(index=keys, columns="Month", values=value, aggfunc="sum", observed=True)
+        .reindex(index=index, columns=MONTH_ORDER)
+    )
@@ -0,0 +1,81 @@
+"""
+Page weight of the two dashboard layouts (DASHBOARD_LAYOUT=panels vs subplots).
+
+The notebook is exported with `marimo export html` against a synthetic feed
+placed in a temporary activity cache (no network), once per layout. Reported
+per layout: exported page bytes (raw and gzip), the bytes of the Plotly
+elements marimo emits, and how many Plotly plots the browser has to create.
+
+    python benchmarks/bench_dashboard_payload.py --rows 20000
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_activity_json  # noqa: E402
+
+# Cell outputs are embedded as JSON strings, so tags may appear as \u003C...
+PLOTLY_ELEMENT = re.compile(r"(?:<|\\u003C)marimo-plotly .*?(?:<|\\u003C)/marimo-plotly", re.S)
+LAYOUTS = ("panels", "subplots")
+
+
+def seed_cache(cache_dir: Path, rows: int) -> None:
+    """A feed cache entry that stays fresh, so the notebook never goes to the network."""
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "anonymousActivityData.json").write_text(synthetic_activity_json(rows), encoding="utf-8")
+    meta = {"url": "https://data.cmiles.info/anonymousActivityData.json", "fetched_at": time.time() + 10 * 365 * 86400}
+    (cache_dir / "anonymousActivityData.meta.json").write_text(json.dumps(meta))
+
+
+def export(layout: str, cache_dir: Path, out: Path) -> float:
+    env = {**os.environ, "ACTIVITY_CACHE_DIR": str(cache_dir), "DASHBOARD_LAYOUT": layout}
+    t0 = time.perf_counter()
+    subprocess.run(["marimo", "export", "html", str(ROOT / "hike-run-notebook.py"), "-o", str(out)],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        seed_cache(cache_dir, args.rows)
+        for layout in LAYOUTS:
+            out = Path(tmp) / f"{layout}.html"
+            seconds = export(layout, cache_dir, out)
+            page = out.read_bytes()
+            elements = PLOTLY_ELEMENT.findall(page.decode("utf-8"))
+            results[layout] = {
+                "export_s": seconds,
+                "page_bytes": len(page),
+                "page_gzip_bytes": len(gzip.compress(page)),
+                "plotly_bytes": sum(len(e.encode("utf-8")) for e in elements),
+                "plots": len(elements),
+            }
+
+    print(f"{'layout':<10} {'page KB':>8} {'gzip KB':>8} {'plotly KB':>10} {'plots':>6} {'export s':>9}")
+    for layout, r in results.items():
+        print(f"{layout:<10} {r['page_bytes'] / 1024:8.1f} {r['page_gzip_bytes'] / 1024:8.1f} "
+              f"{r['plotly_bytes'] / 1024:10.1f} {r['plots']:6d} {r['export_s']:9.1f}")
+    before, after = results["panels"], results["subplots"]
+    print(f"subplots vs panels: {1 - after['page_bytes'] / before['page_bytes']:.0%} fewer page bytes, "
+          f"{1 - after['page_gzip_bytes'] / before['page_gzip_bytes']:.0%} fewer gzip bytes, "
+          f"{before['plots'] - after['plots']} fewer plots to create")
+
+
+if __name__ == "__main__":
+    main()
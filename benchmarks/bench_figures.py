@@ -0,0 +1,84 @@
+"""
+Render time of the dashboard figures with and without figure_cache.
+
+One "render" builds and serializes what the notebook shows: four gauge + bar
+card pairs (to HTML, as marimo embeds them) and the monthly heatmap (to
+JSON). The uncached path builds every figure on every render; the cached path
+serves repeat renders from FigureCache.
+
+    python benchmarks/bench_figures.py --renders 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import dashboard_figures  # noqa: E402
+from figure_cache import FigureCache  # noqa: E402
+
+GAUGE_SIZE = dict(width=160, height=150, margins=(22, 30, 12, 12), number_font_size=16, delta_font_size=12)
+BAR_SIZE = dict(width=None, height=150, margins=(80, 18, 20, 16))
+CATEGORY_ORDER = ["2025-10-11", "2025-10-04", "2024-10-12", "10 Year Median"][::-1]
+
+
+def synthetic_inputs(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    cards = []
+    for title, suffix in (("Distance", "mi"), ("Activities", ""), ("Duration", "h"), ("Climb", "ft")):
+        values = rng.uniform(10, 100, 4).round(1)
+        metric_df = pd.DataFrame({"matchLabel": CATEGORY_ORDER[::-1], "value": values})
+        cards.append((title, suffix, metric_df, values[1], values[0]))
+    pivot = pd.DataFrame(rng.uniform(0, 120, (15, 12)), index=range(2011, 2026),
+                         columns=["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+    return cards, pivot
+
+
+def render(cards, pivot, cache: FigureCache | None) -> None:
+    def figure(build, *args, serialize, **kwargs):
+        if cache is None:
+            return serialize(build(*args, **kwargs))
+        return cache.figure(build, *args, serialize=serialize, **kwargs)
+
+    for title, suffix, metric_df, latest, median in cards:
+        figure(dashboard_figures.build_gauge_fig, latest, median, suffix,
+               serialize=dashboard_figures.figure_html, **GAUGE_SIZE)
+        figure(dashboard_figures.build_bar_fig, metric_df, title, suffix, category_order=CATEGORY_ORDER,
+               serialize=dashboard_figures.figure_html, **BAR_SIZE)
+    figure(dashboard_figures.build_monthly_heatmap_fig, pivot, 2011, 2025, serialize=dashboard_figures.figure_json)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=20)
+    args = parser.parse_args()
+
+    cards, pivot = synthetic_inputs()
+    render(cards, pivot, None)  # warm up Plotly's lazy imports and validators
+
+    results = {}
+    for name, cache in (("uncached", None), ("cached", FigureCache())):
+        timings = []
+        for _ in range(args.renders):
+            t0 = time.perf_counter()
+            render(cards, pivot, cache)
+            timings.append(time.perf_counter() - t0)
+        results[name] = timings
+
+    uncached = statistics.median(results["uncached"])
+    cold = results["cached"][0]
+    warm = statistics.median(results["cached"][1:])
+    print(f"{args.renders} renders of 8 card figures + heatmap")
+    print(f"uncached render (median): {uncached * 1000:9.1f} ms")
+    print(f"cached, first render:     {cold * 1000:9.1f} ms")
+    print(f"cached, repeat (median):  {warm * 1000:9.1f} ms  ({uncached / warm:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Import time of date_tools, each measurement in a fresh interpreter
+(`python -X importtime`, cumulative microseconds of the imported module,
+including everything it pulls in). With --rev, the date_tools of that git
+revision is measured too, e.g. the single-module version before the package:
+
+    python benchmarks/bench_imports.py --rev HEAD~1 --repeat 7
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STATEMENTS = ("import date_tools", "import date_tools.arrays", "import date_tools.frames")
+
+
+def import_seconds(statement: str, path: Path) -> float | None:
+    """Cumulative import seconds of the module named in statement, or None if it cannot be imported."""
+    module = statement.split()[-1]
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=path,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    pattern = re.compile(rf"import time:\s+\d+ \|\s+(\d+) \|\s*{re.escape(module)}$")
+    times = [int(m.group(1)) for m in map(pattern.match, result.stderr.splitlines()) if m]
+    return times[-1] / 1e6 if times else None
+
+
+def checkout_date_tools(rev: str, target: Path) -> None:
+    """Write date_tools.py or the date_tools/ package of rev into target."""
+    names = subprocess.run(["git", "ls-tree", "-r", "--name-only", rev], cwd=ROOT, check=True,
+                           capture_output=True, text=True).stdout.split()
+    for name in names:
+        if name == "date_tools.py" or name.startswith("date_tools/"):
+            out = target / name
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_bytes(subprocess.run(["git", "show", f"{rev}:{name}"], cwd=ROOT, check=True,
+                                           capture_output=True).stdout)
+
+
+def measure(path: Path, repeat: int) -> dict:
+    results = {}
+    for statement in STATEMENTS:
+        runs = [import_seconds(statement, path) for _ in range(repeat)]
+        results[statement] = None if None in runs else statistics.median(runs)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rev", help="also measure date_tools as of this git revision")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    columns = {"working tree": measure(ROOT, args.repeat)}
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkout_date_tools(args.rev, Path(tmp))
+            columns[args.rev] = measure(Path(tmp), args.repeat)
+
+    print(f"{'statement':<28}" + "".join(f"{name:>16}" for name in columns))
+    for statement in STATEMENTS:
+        cells = [columns[name][statement] for name in columns]
+        print(f"{statement:<28}" + "".join(f"{'-' if s is None else f'{s * 1000:.1f} ms':>16}" for s in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-call overhead of the instrumentation layer: a trivial function called
+plain, through @instrumented while tracing is disabled, and while enabled
+(with the stage log lines discarded), plus stage() used as a context manager.
+
+    python benchmarks/bench_instrumentation.py --calls 200000
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import instrumentation  # noqa: E402
+
+
+def per_call_ns(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    logging.getLogger("hike_run.stages").disabled = True
+
+    def plain():
+        return None
+
+    decorated = instrumentation.instrumented("bench/noop")(plain)
+
+    def with_stage():
+        with instrumentation.stage("bench/noop"):
+            return None
+
+    rows = []
+    for enabled in (False, True):
+        instrumentation.set_enabled(enabled)
+        calls = args.calls if not enabled else args.calls // 10
+        rows.append(("plain", enabled, per_call_ns(plain, calls)))
+        rows.append(("@instrumented", enabled, per_call_ns(decorated, calls)))
+        rows.append(("with stage()", enabled, per_call_ns(with_stage, calls)))
+    instrumentation.set_enabled(False)
+    instrumentation.clear()
+
+    print(f"{'call':<16} {'tracing':<9} {'ns/call':>10}")
+    for name, enabled, ns in rows:
+        print(f"{name:<16} {'on' if enabled else 'off':<9} {ns:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
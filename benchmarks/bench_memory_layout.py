@@ -0,0 +1,57 @@
+"""
+Bytes per activity of the prepared activity table (prepare_activities) vs the
+compact layout (CompactActivities), on a large synthetic history, plus the
+cost of computing the derived columns on access and of a DailyRollup over
+each.
+
+    python benchmarks/bench_memory_layout.py --rows 2000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import activity_data  # noqa: E402
+import activity_rollup  # noqa: E402
+from compact_activities import CompactActivities  # noqa: E402
+from synthetic import synthetic_activities  # noqa: E402
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="raw feed rows (about half are On Foot)")
+    args = parser.parse_args()
+
+    lines = activity_data.prepare_activities(synthetic_activities(args.rows, 2005, 2025))
+    compact, compact_s = timed(lambda: CompactActivities.from_prepared(lines))
+    n = len(lines)
+
+    print(f"{n:,} activities")
+    print(f"{'layout':<10} {'bytes/activity':>15} {'total MB':>9}")
+    for name, nbytes in (("prepared", int(lines.memory_usage(index=True, deep=True).sum())),
+                         ("compact", compact.memory_usage_bytes())):
+        print(f"{name:<10} {nbytes / n:15.1f} {nbytes / 2**20:9.1f}")
+    print(f"compacting took {compact_s:.2f} s")
+
+    print("derived column on access (s):")
+    for column in CompactActivities.DERIVED_COLUMNS:
+        _, seconds = timed(lambda: compact[column])
+        print(f"  {column:<20} {seconds:.3f}")
+
+    for name, table in (("prepared", lines), ("compact", compact)):
+        _, seconds = timed(lambda: activity_rollup.DailyRollup.from_lines(table))
+        print(f"DailyRollup.from_lines({name}): {seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Offline benchmark suite for date_tools and the notebook's data pipeline.
+
+Every case runs against a synthetic activity feed (see synthetic.py) and
+records the median wall time over --repeat runs and the peak traced
+allocation (tracemalloc) of one extra run. Results are written as JSON so two
+commits can be compared:
+
+    python benchmarks/bench_pipeline.py --rows 200000 --output before.json
+    python benchmarks/bench_pipeline.py --rows 200000 --output after.json --compare before.json
+
+--compare refuses a baseline that was run with different workload settings
+(rows, years, activity types or range counts).
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import activity_data  # noqa: E402
+import activity_rollup  # noqa: E402
+import date_tools  # noqa: E402
+from training_load import TrainingLoad  # noqa: E402
+from synthetic import DEFAULT_ACTIVITY_TYPES, synthetic_activities  # noqa: E402
+
+REFERENCE_DATE = date(2025, 10, 17)
+SUMMARY_AGGREGATIONS = dict(
+    totalDistanceMiles=('distanceMiles', 'sum'),
+    totalActivities=('folder', 'count'),
+    totalDurationMinutes=('durationMinutes', 'sum'),
+    totalClimbFeet=('climbFeet', 'sum'),
+)
+# Settings that change the workload: results are only comparable when these match
+WORKLOAD_PARAMS = ("rows", "first_year", "last_year", "activity_types", "range_counts")
+
+
+def measure(fn, repeat: int) -> dict:
+    """Median/min seconds over repeat runs plus the tracemalloc peak of one more run."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "peak_mb": peak / 1e6}
+
+
+def weekly_ranges(count: int, as_str: bool) -> list:
+    """count one-week windows going back from REFERENCE_DATE (every week, not just same-week-of-year)."""
+    ranges = [date_tools.previous_weeks(REFERENCE_DATE - pd.Timedelta(weeks=w).to_pytimedelta())
+              for w in range(count)]
+    return [(str(lo), str(hi)) for lo, hi in ranges] if as_str else ranges
+
+
+def build_cases(raw: pd.DataFrame, feed_path: Path, snapshot_dir: Path, range_counts: list[int]) -> dict:
+    feed_text = feed_path.read_text(encoding="utf-8")
+    lines = activity_data.prepare_activities(raw)
+    rollup = activity_rollup.DailyRollup.from_lines(lines)
+    four_weeks = date_tools.previous_weeks_years_back(REFERENCE_DATE, weeks_back=4, years_back=10)
+    # Every day of the history as a reference date (rolling analysis)
+    history_days = np.arange(lines["start"].min().date(), REFERENCE_DATE + pd.Timedelta(days=1).to_pytimedelta(),
+                             dtype="datetime64[D]")
+    history_dates = history_days.astype(object).tolist()
+    first_year = lines["start"].min().year + 1
+    activity_data.load_prepared_activities(feed_path, snapshot_dir)
+
+    cases = {
+        "load/read_json+prepare": lambda: activity_data.prepare_activities(pd.read_json(StringIO(feed_text))),
+        "load/stream+prepare": lambda: activity_data.prepare_activities(activity_data.read_feed(feed_path)),
+        "load/snapshot": lambda: activity_data.read_snapshot(snapshot_dir, activity_data.feed_key(feed_path)),
+        "derive/prepare_activities": lambda: activity_data.prepare_activities(raw),
+        "derive/daily_rollup": lambda: activity_rollup.DailyRollup.from_lines(lines),
+        "four_weeks/filter_in_ranges+groupby": lambda: date_tools.filter_in_ranges(
+            lines, 'start', four_weeks).groupby('matchStart').agg(**SUMMARY_AGGREGATIONS),
+        "four_weeks/summarize_previous_weeks_years_back": lambda: date_tools.summarize_previous_weeks_years_back(
+            lines, 'start', REFERENCE_DATE, 4, 10, **SUMMARY_AGGREGATIONS),
+        "four_weeks/rollup_windows": lambda: rollup.windows(four_weeks, drop_empty=True),
+        "monthly/pivot": lambda: activity_rollup.monthly_pivot(rollup, first_year, REFERENCE_DATE.year),
+        "training_load/from_rollup+frame": lambda: TrainingLoad.from_rollup(rollup).frame(),
+        "windows/previous_weeks_years_back_every_day": lambda: [
+            date_tools.previous_weeks_years_back(d, weeks_back=4, years_back=10) for d in history_dates],
+        "windows/previous_weeks_years_back_batch_every_day": lambda: date_tools.previous_weeks_years_back_batch(
+            history_days, weeks_back=4, years_back=10),
+    }
+    for count in range_counts:
+        for bounds in ("date", "str"):
+            ranges = weekly_ranges(count, as_str=bounds == "str")
+            # mask+object is the original implementation, the baseline for the others
+            for engine, compare in (("interval", "datetime64"), ("interval", "object"), ("mask", "datetime64"),
+                                    ("mask", "object")):
+                # The mask engine is O(rows x ranges); keep it to the small range counts
+                if engine == "mask" and count > 100:
+                    continue
+                cases[f"filter_in_ranges/{count}x{bounds}/{engine}+{compare}"] = (
+                    lambda r=ranges, e=engine, c=compare: date_tools.filter_in_ranges(lines, 'start', r, engine=e, compare=c))
+    return cases
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def workload_mismatches(params: dict, baseline_params: dict) -> list[str]:
+    """The WORKLOAD_PARAMS that differ between two runs, as 'name: baseline -> this run'."""
+    return [f"{name}: {baseline_params.get(name)!r} -> {params.get(name)!r}" for name in WORKLOAD_PARAMS
+            if params.get(name) != baseline_params.get(name)]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> None:
+    """Print the time ratio against a baseline results file, flagging slowdowns above threshold."""
+    before = {c["name"]: c for c in baseline["cases"]}
+    print(f"\nvs. {baseline.get('revision') or 'baseline'} ({baseline['params']['rows']:,} rows)")
+    for case in results["cases"]:
+        old = before.get(case["name"])
+        if old is None:
+            continue
+        ratio = case["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{case['name']:<62} {ratio:6.2f}x time {case['peak_mb'] - old['peak_mb']:+9.1f} MB{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--first-year", type=int, default=2010)
+    parser.add_argument("--last-year", type=int, default=REFERENCE_DATE.year)
+    parser.add_argument("--activity-types", nargs="+", default=list(DEFAULT_ACTIVITY_TYPES))
+    parser.add_argument("--range-counts", type=int, nargs="+", default=[11, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        mismatches = workload_mismatches(vars(args), baseline["params"])
+        if mismatches:
+            parser.error(f"{args.compare} was run with different settings, its timings are not comparable "
+                         f"({'; '.join(mismatches)})")
+
+    raw = synthetic_activities(args.rows, args.first_year, args.last_year, tuple(args.activity_types))
+    raw["start"] = pd.to_datetime(raw["start"])
+    raw["end"] = pd.to_datetime(raw["end"])
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "params": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "cases": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        feed_path = Path(tmp) / "anonymousActivityData.json"
+        feed_path.write_text(raw.to_json(orient="records", date_format="iso"), encoding="utf-8")
+        cases = build_cases(raw, feed_path, Path(tmp) / "snapshots", args.range_counts)
+
+        print(f"{'case':<62} {'median s':>9} {'peak MB':>9}")
+        for name, fn in cases.items():
+            if args.only not in name:
+                continue
+            result = {"name": name, **measure(fn, args.repeat)}
+            results["cases"].append(result)
+            print(f"{name:<62} {result['median_s']:9.4f} {result['peak_mb']:9.1f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if baseline is not None:
+        compare(results, baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
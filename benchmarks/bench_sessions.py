@@ -0,0 +1,150 @@
+"""
+Load test for concurrent dashboard sessions in one server process, the way
+`marimo run` hosts them (one thread per session).
+
+- per-session: every session downloads the feed, parses it with
+  pd.read_json, prepares its own copy of lines and groups the last four weeks
+  (the notebook before shared_data).
+- shared: every session asks shared_data.SharedActivityData for the
+  process-wide snapshot and reads its summaries from the shared rollup.
+
+Each session ends by rendering a bar chart to HTML. The feed is served from a
+local HTTP server; each mode runs in a fresh interpreter and reports peak RSS
+and time-to-first-render per session.
+
+    python benchmarks/bench_sessions.py --rows 200000 --sessions 20
+"""
+import argparse
+import functools
+import http.server
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+REFERENCE_DATE = date(2025, 10, 17)
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def peak_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+
+
+def render(summary) -> str:
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Bar(x=summary["totalDistanceMiles"], y=summary["matchStart"].astype(str), orientation="h"))
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def per_session(url: str, _cache_dir: str):
+    import pandas as pd
+    import requests
+    import activity_data
+    import date_tools
+
+    def session():
+        response = requests.get(url)
+        response.raise_for_status()
+        lines = activity_data.prepare_activities(pd.read_json(StringIO(response.text)))
+        ranges = date_tools.previous_weeks_years_back(REFERENCE_DATE, weeks_back=4, years_back=10)
+        summary = date_tools.filter_in_ranges(lines, 'start', ranges).groupby('matchStart').agg(
+            totalDistanceMiles=('distanceMiles', 'sum')).reset_index()
+        return render(summary)
+    return session
+
+
+def shared(url: str, cache_dir: str):
+    import activity_data
+    import activity_rollup
+    import date_tools
+    import shared_data
+
+    def loader():
+        path = activity_data.fetch_activity_file(url, cache_dir)
+        lines = activity_data.load_prepared_activities(path, snapshot_dir=None)
+        return shared_data.ActivitySnapshot(lines, activity_rollup.DailyRollup.from_lines(lines))
+
+    data = shared_data.SharedActivityData(loader)
+
+    def session():
+        snapshot = data.get()
+        snapshot.session_lines()
+        ranges = date_tools.previous_weeks_years_back(REFERENCE_DATE, weeks_back=4, years_back=10)
+        return render(snapshot.rollup.windows(ranges, drop_empty=True))
+    return session
+
+
+MODES = {"per-session": per_session, "shared": shared}
+
+
+def child(mode: str, url: str, cache_dir: str, sessions: int) -> None:
+    import plotly.graph_objects  # noqa: F401  (imports are not part of time-to-first-render)
+    session = MODES[mode](url, cache_dir)
+    started = time.perf_counter()
+
+    def timed(_):
+        t0 = time.perf_counter()
+        session()
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        ttfr = list(pool.map(timed, range(sessions)))
+    print(json.dumps({"wall_s": time.perf_counter() - started, "ttfr": ttfr, "peak_mb": peak_rss_mb()}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "URL", "CACHE_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.sessions)
+        return
+
+    from synthetic import synthetic_activity_json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = Path(tmp) / "anonymousActivityData.json"
+        feed.write_text(synthetic_activity_json(args.rows), encoding="utf-8")
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=tmp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/{feed.name}"
+        try:
+            results = {}
+            for mode in MODES:
+                cache_dir = str(Path(tmp) / f"cache-{mode}")
+                out = subprocess.run([sys.executable, __file__, "--sessions", str(args.sessions),
+                                      "--child", mode, url, cache_dir],
+                                     check=True, capture_output=True, text=True)
+                results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{args.sessions} concurrent sessions, {args.rows:,} feed rows")
+    print(f"{'mode':<12} {'wall s':>7} {'TTFR median':>12} {'TTFR max':>9} {'peak RSS MB':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<12} {r['wall_s']:7.2f} {statistics.median(r['ttfr']):12.2f} "
+              f"{max(r['ttfr']):9.2f} {r['peak_mb']:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-start time of the prepared activity table: parsing the JSON feed and
+deriving columns vs. loading the memory-mapped snapshot.
+
+Each measurement runs in a fresh interpreter (like a new `marimo run` process);
+import time is excluded.
+
+    python benchmarks/bench_snapshot.py --rows 1000000 --repeat 3
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_activity_json  # noqa: E402
+
+COLD_START = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import activity_data
+activity_json = open({feed!r}, encoding="utf-8").read()
+t0 = time.perf_counter()
+lines = activity_data.load_prepared_activities(activity_json, snapshot_dir={snapshot_dir!r})
+lines["distanceMiles"].sum()
+print(json.dumps({{"seconds": time.perf_counter() - t0, "rows": len(lines)}}))
+"""
+
+
+def cold_start(feed: Path, snapshot_dir: str | None) -> dict:
+    code = COLD_START.format(root=str(ROOT), feed=str(feed), snapshot_dir=snapshot_dir)
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = Path(tmp) / "anonymousActivityData.json"
+        feed.write_text(synthetic_activity_json(args.rows), encoding="utf-8")
+        snapshot_dir = str(Path(tmp) / "snapshots")
+
+        json_runs = [cold_start(feed, None) for _ in range(args.repeat)]
+        cold_start(feed, snapshot_dir)  # build the snapshot
+        snapshot_runs = [cold_start(feed, snapshot_dir) for _ in range(args.repeat)]
+
+    json_s = statistics.median(r["seconds"] for r in json_runs)
+    snapshot_s = statistics.median(r["seconds"] for r in snapshot_runs)
+    print(f"feed rows:        {args.rows:,} ({json_runs[0]['rows']:,} On Foot)")
+    print(f"json path:        {json_s:8.3f} s")
+    print(f"snapshot path:    {snapshot_s:8.3f} s")
+    print(f"speedup:          {json_s / snapshot_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
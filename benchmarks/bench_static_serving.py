@@ -0,0 +1,163 @@
+"""
+Throughput of the static dashboard bundle vs the live notebook, both served
+by serve.py with STATIC_DIR set (static at /, live at /live/), under a local
+load generator with --concurrency simultaneous clients for --duration
+seconds each:
+
+- static: GET / (the exported dashboard, full body)
+- static 304: GET / with If-None-Match (a browser revalidating its cached copy)
+- live: what one visitor of the live app costs: GET /live/, then a session
+  websocket held until the notebook's run completes (`completed-run`)
+
+The server runs against a synthetic feed placed in a temporary activity cache
+(no network). The live load uses the websockets client that uvicorn installs.
+
+    python benchmarks/bench_static_serving.py --concurrency 8 --duration 15
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_dashboard_payload import seed_cache  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_bundle(port: int, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/manifest.json")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("the static bundle was not built in time")
+
+
+def static_load(port: int, concurrency: int, duration: float, headers: dict) -> list[float]:
+    """Latencies of GET / by concurrency keep-alive clients for duration seconds."""
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine = []
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            conn.request("GET", "/", headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status not in (200, 304):
+                raise RuntimeError(f"GET / returned {response.status}")
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+async def live_visit(port: int) -> None:
+    import websockets
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /live/ HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+    url = f"ws://127.0.0.1:{port}/live/ws?session_id=s_{uuid.uuid4().hex[:12]}"
+    async with websockets.connect(url, max_size=None) as ws:
+        while True:
+            message = json.loads(await asyncio.wait_for(ws.recv(), 120))
+            if message.get("op") == "completed-run":
+                return
+
+
+def live_load(port: int, concurrency: int, duration: float) -> list[float]:
+    """Latencies of whole live visits by concurrency clients for duration seconds."""
+    latencies: list[float] = []
+
+    async def client(deadline):
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            await live_visit(port)
+            latencies.append(time.perf_counter() - t0)
+
+    async def run():
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(client(deadline) for _ in range(concurrency)))
+
+    asyncio.run(run())
+    return latencies
+
+
+def report(name: str, latencies: list[float], duration: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(f"{name:<12} {len(latencies) / duration:10.1f} {statistics.median(ordered) * 1000:10.1f} "
+          f"{p95 * 1000:10.1f} {len(latencies):8d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir, static_dir = Path(tmp) / "cache", Path(tmp) / "static"
+        seed_cache(cache_dir, args.rows)
+        port = free_port()
+        env = {**os.environ, "ACTIVITY_CACHE_DIR": str(cache_dir), "STATIC_DIR": str(static_dir),
+               "PORT": str(port), "HOST": "127.0.0.1"}
+        server = subprocess.Popen([sys.executable, "serve.py"], cwd=ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_bundle(port, timeout=180)
+            etag = json.loads((static_dir / "manifest.json").read_text())["key"]
+            results = {
+                "static": static_load(port, args.concurrency, args.duration, {}),
+                "static 304": static_load(port, args.concurrency, args.duration, {"If-None-Match": f'"{etag}"'}),
+                "live": live_load(port, args.concurrency, args.duration),
+            }
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"{args.concurrency} clients x {args.duration:.0f} s, {args.rows:,} feed rows")
+    print(f"{'mode':<12} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'requests':>8}")
+    for name, latencies in results.items():
+        report(name, latencies, args.duration)
+    print(f"static vs live: {len(results['static']) / max(1, len(results['live'])):.0f}x the visitors served")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Peak memory of ingesting the activity feed: the current path
+(requests.get -> response.text -> StringIO -> pd.read_json -> query) vs.
+streaming the response through activity_data.read_activity_stream.
+
+The synthetic feed is served from a local HTTP server; each path runs in a
+fresh interpreter and reports its peak RSS (VmHWM, Linux) and the RSS growth over
+the post-import baseline.
+
+    python benchmarks/bench_streaming.py --rows 1000000
+"""
+import argparse
+import functools
+import http.server
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import synthetic_activity_json  # noqa: E402
+
+PRELUDE = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+import requests, pandas as pd, numpy as np
+from io import StringIO
+import activity_data
+def rss_mb():
+    # VmHWM: peak resident set of this process image (ru_maxrss can carry over the parent's peak)
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+baseline = rss_mb()
+t0 = time.perf_counter()
+"""
+
+CURRENT = PRELUDE + """
+response = requests.get({url!r})
+response.raise_for_status()
+lines = pd.read_json(StringIO(response.text))
+lines = lines.query('activityType == "On Foot"')
+print(json.dumps({{"seconds": time.perf_counter() - t0, "peak_mb": rss_mb(), "growth_mb": rss_mb() - baseline, "rows": len(lines)}}))
+"""
+
+STREAMING = PRELUDE + """
+with requests.get({url!r}, stream=True) as response:
+    response.raise_for_status()
+    lines = activity_data.read_activity_stream(response.iter_content(chunk_size=activity_data.FEED_CHUNK_BYTES))
+print(json.dumps({{"seconds": time.perf_counter() - t0, "peak_mb": rss_mb(), "growth_mb": rss_mb() - baseline, "rows": len(lines)}}))
+"""
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def run(template: str, url: str) -> dict:
+    code = template.format(root=str(ROOT), url=url)
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = Path(tmp) / "anonymousActivityData.json"
+        feed.write_text(synthetic_activity_json(args.rows), encoding="utf-8")
+
+        feed_mb = feed.stat().st_size / 1e6
+        handler = functools.partial(QuietHandler, directory=tmp)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/{feed.name}"
+        try:
+            current = run(CURRENT, url)
+            streaming = run(STREAMING, url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"feed rows:   {args.rows:,} ({feed_mb:.0f} MB, {current['rows']:,} On Foot)")
+    print(f"{'path':<12} {'seconds':>8} {'peak RSS MB':>12} {'growth MB':>10}")
+    for name, r in (("current", current), ("streaming", streaming)):
+        print(f"{name:<12} {r['seconds']:8.2f} {r['peak_mb']:12.0f} {r['growth_mb']:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
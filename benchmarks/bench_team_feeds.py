@@ -0,0 +1,121 @@
+"""
+Loading many athletes' feeds: one after the other vs concurrently
+(team_data.load_team_activities), against a local stub HTTP server that
+serves synthetic feeds with a fixed per-request latency. Also checks that the
+batched per-athlete four-week comparison and monthly pivots match computing
+them one athlete at a time, and times both.
+
+    python benchmarks/bench_team_feeds.py --athletes 24 --rows 20000 --latency 0.2
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import activity_rollup  # noqa: E402
+import date_tools  # noqa: E402
+import team_data  # noqa: E402
+from synthetic import synthetic_activity_json  # noqa: E402
+
+
+class StubFeedHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_feeds(feed_dir: Path, latency: float) -> ThreadingHTTPServer:
+    handler = type("Handler", (StubFeedHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(feed_dir)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def per_athlete_loop(team: pd.DataFrame, ranges: list, end_year: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """The single-athlete notebook computations, repeated for each athlete."""
+    comparisons, pivots = {}, {}
+    for athlete, lines in team.groupby(team_data.ATHLETE_COLUMN, observed=True, sort=False):
+        rollup = activity_rollup.DailyRollup.from_lines(lines)
+        windows = activity_rollup.window_summary(rollup, ranges)
+        comparisons[athlete] = pd.concat({"latest": windows.iloc[-1][["matchStart", *team_data.WINDOW_METRICS]],
+                                          "median": windows[team_data.WINDOW_METRICS].median()})
+        pivots[athlete] = activity_rollup.monthly_pivot(rollup, lines["start"].min().year + 1, end_year)
+    return pd.DataFrame(comparisons).T, pd.concat(pivots, names=[team_data.ATHLETE_COLUMN])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--athletes", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=20_000, help="raw feed rows per athlete")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds the stub server waits per request")
+    parser.add_argument("--workers", type=int, default=team_data.DEFAULT_FEED_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        feed_dir = Path(tmp) / "feeds"
+        feed_dir.mkdir()
+        for i in range(args.athletes):
+            (feed_dir / f"athlete{i:03d}.json").write_text(
+                synthetic_activity_json(args.rows, first_year=2008 + i % 8, seed=i), encoding="utf-8")
+        server = serve_feeds(feed_dir, args.latency)
+        base = f"http://127.0.0.1:{server.server_port}"
+        feeds = {f"athlete{i:03d}": f"{base}/athlete{i:03d}.json" for i in range(args.athletes)}
+
+        try:
+            sequential, sequential_s = timed(
+                lambda: team_data.load_team_activities(feeds, Path(tmp) / "sequential", max_workers=1))
+            team, parallel_s = timed(
+                lambda: team_data.load_team_activities(feeds, Path(tmp) / "parallel", max_workers=args.workers))
+        finally:
+            server.shutdown()
+
+    pd.testing.assert_frame_equal(sequential, team)
+    print(f"{args.athletes} feeds x {args.rows:,} rows, {args.latency:.2f} s latency: "
+          f"{len(team):,} activities")
+    print(f"  sequential load      {sequential_s:7.2f} s")
+    print(f"  {args.workers} workers            {parallel_s:7.2f} s  ({sequential_s / parallel_s:.1f}x)")
+
+    today = date.today()
+    ranges = date_tools.previous_weeks_years_back(today, weeks_back=4, years_back=10)
+    first_years = team.groupby(team_data.ATHLETE_COLUMN, observed=True)["start"].min().dt.year + 1
+
+    def batched():
+        rollup = activity_rollup.DailyRollup.from_lines(team, by=team_data.ATHLETE_COLUMN)
+        return (team_data.four_week_comparison(rollup, ranges),
+                activity_rollup.monthly_pivot(rollup, first_years, today.year))
+
+    (comparison, pivots), batched_s = timed(batched)
+    (loop_comparison, loop_pivots), loop_s = timed(lambda: per_athlete_loop(team, ranges, today.year))
+
+    loop_comparison.columns = loop_comparison.columns.swaplevel()
+    loop_comparison = loop_comparison.reindex(columns=comparison.columns).astype(comparison.dtypes)
+    pd.testing.assert_frame_equal(comparison, loop_comparison, check_names=False, check_index_type=False)
+    pd.testing.assert_frame_equal(pivots, loop_pivots, check_names=False, check_index_type=False,
+                                  check_column_type=False)
+    print(f"  per-athlete summaries: batched {batched_s:.3f} s, loop {loop_s:.3f} s (results match)")
+
+
+if __name__ == "__main__":
+    main()
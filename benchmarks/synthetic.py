@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_ACTIVITY_TYPES = ("On Foot", "Cycling", "Paddling", "Skiing")
+
+
+def synthetic_activities(n_rows: int = 100_000, first_year: int = 2010, last_year: int = 2025,
+                         activity_types: tuple[str, ...] = DEFAULT_ACTIVITY_TYPES,
+                         seed: int = 0) -> pd.DataFrame:
+    """
+    Raw activity feed rows shaped like anonymousActivityData.json (folder,
+    activityType, start, end, distanceMiles, climbFeet), with 'On Foot' as the
+    most common activity type.
+
+    >>> synthetic_activities(3, 2020, 2020).columns.tolist()
+    ['folder', 'activityType', 'start', 'end', 'distanceMiles', 'climbFeet']
+    """
+    rng = np.random.default_rng(seed)
+    span_start = np.datetime64(f"{first_year}-01-01T00:00:00", "s")
+    span_seconds = int((np.datetime64(f"{last_year + 1}-01-01T00:00:00", "s") - span_start).astype(np.int64))
+
+    start = np.sort(span_start + rng.integers(0, span_seconds, n_rows).astype("timedelta64[s]"))
+    duration = rng.gamma(2.0, 40.0, n_rows).astype(np.int64) * 60 + 300
+    end = start + duration.astype("timedelta64[s]")
+
+    weights = np.array([3.0] + [1.0] * (len(activity_types) - 1))
+    types = rng.choice(np.array(activity_types, dtype=object), n_rows, p=weights / weights.sum())
+
+    distance = np.round(duration / 60 / 20 * rng.uniform(0.6, 1.4, n_rows), 2)
+    climb = np.round(distance * rng.gamma(2.0, 60.0, n_rows), 0)
+
+    return pd.DataFrame({
+        "folder": start.astype("datetime64[Y]").astype(int) + 1970,
+        "activityType": types,
+        "start": np.datetime_as_string(start),
+        "end": np.datetime_as_string(end),
+        "distanceMiles": distance,
+        "climbFeet": climb,
+    })
+
+
+def synthetic_activity_json(n_rows: int = 100_000, **kwargs) -> str:
+    """The synthetic_activities rows serialized as the feed's JSON array of records."""
+    return synthetic_activities(n_rows, **kwargs).to_json(orient="records")
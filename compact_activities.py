@@ -0,0 +1,144 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+DAY_NAMES = list(calendar.day_name)
+# durationSeconds of activities without a start or end
+MISSING_SECONDS = np.iinfo(np.int32).min
+
+
+def _as_categorical(column: pd.Series) -> pd.Categorical:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.array
+    return pd.Categorical(column.astype(str))
+
+
+class CompactActivities:
+    """
+    Memory-lean stand-in for the prepared activity table (prepare_activities).
+
+    Only base columns are stored, in small dtypes:
+      - start: datetime64[s]
+      - durationSeconds: int32 (end is start + durationSeconds)
+      - distanceMiles, climbFeet: float32
+      - folder, activityType: categoricals (int8 codes for fewer than 128 categories)
+
+    end, durationMinutes, startYear, startMonth, startMonthDateTime, startWeekday
+    and startHour are computed from start / durationSeconds when accessed, with
+    the same dtypes and categories as prepare_activities produces. The index is
+    a RangeIndex (row order is kept, index labels are not). Column access
+    (compact["startHour"]) returns a Series, so DailyRollup.from_lines and other
+    column-by-column readers accept this in place of the DataFrame; to_frame()
+    materializes a regular DataFrame. Metrics are float32, so sums can differ
+    from the float64 table in the last few significant digits. A missing start
+    (NaT) or end is kept as missing: derived columns are NaT/NaN for it and it
+    does not widen the startYear categories.
+
+    >>> lines = pd.DataFrame({
+    ...     "folder": pd.Categorical(["2024"]), "activityType": pd.Categorical(["On Foot"]),
+    ...     "start": pd.to_datetime(["2024-10-01 08:30"]), "end": pd.to_datetime(["2024-10-01 09:45"]),
+    ...     "distanceMiles": [3.5], "climbFeet": [420.0]})
+    >>> compact = CompactActivities.from_prepared(lines)
+    >>> compact["durationMinutes"].tolist(), compact["startWeekday"].tolist(), compact["startHour"].tolist()
+    ([75.0], ['Tuesday'], [8])
+    """
+
+    BASE_COLUMNS = ("folder", "activityType", "start", "durationSeconds", "distanceMiles", "climbFeet")
+    DERIVED_COLUMNS = ("end", "startYear", "durationMinutes", "startMonth", "startMonthDateTime",
+                       "startWeekday", "startHour")
+
+    def __init__(self, base: pd.DataFrame):
+        self.base = base
+
+    @classmethod
+    def from_prepared(cls, lines: pd.DataFrame) -> "CompactActivities":
+        """Compact a prepared table (or any frame with folder, activityType, start, end and the metrics)."""
+        start = pd.to_datetime(lines["start"]).to_numpy().astype("datetime64[s]")
+        end = pd.to_datetime(lines["end"]).to_numpy().astype("datetime64[s]")
+        duration = end - start
+        seconds = np.where(np.isnat(duration), MISSING_SECONDS, duration.astype(np.int64)).astype(np.int32)
+        base = pd.DataFrame({
+            "folder": _as_categorical(lines["folder"]),
+            "activityType": _as_categorical(lines["activityType"]),
+            "start": start,
+            "durationSeconds": seconds,
+            "distanceMiles": lines["distanceMiles"].to_numpy(dtype=np.float32),
+            "climbFeet": lines["climbFeet"].to_numpy(dtype=np.float32),
+        })
+        return cls(base)
+
+    @property
+    def index(self) -> pd.Index:
+        return self.base.index
+
+    @property
+    def columns(self) -> list[str]:
+        return [*self.BASE_COLUMNS, *self.DERIVED_COLUMNS]
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def _start_parts(self):
+        start = self.base["start"].to_numpy()
+        valid = ~np.isnat(start)
+        days = start.astype("datetime64[D]")
+        seconds_of_day = (start - days).astype(np.int64)
+        return start, valid, days, seconds_of_day
+
+    def _duration(self):
+        seconds = self.base["durationSeconds"].to_numpy()
+        return seconds, seconds != MISSING_SECONDS
+
+    def _derive(self, name: str) -> pd.Series:
+        start, valid, days, seconds_of_day = self._start_parts()
+        if name == "end":
+            seconds, known = self._duration()
+            values = np.where(known, start + seconds.astype("timedelta64[s]"), np.datetime64("NaT", "s"))
+        elif name == "durationMinutes":
+            seconds, known = self._duration()
+            values = np.where(known, np.round(seconds / 60, 0), np.nan)
+        elif name == "startYear":
+            years = start.astype("datetime64[Y]").astype(np.int64) + 1970
+            first, last = (int(years[valid].min()), int(years[valid].max())) if valid.any() else (0, -1)
+            values = pd.Categorical.from_codes(np.where(valid, years - first, -1),
+                                               categories=range(first, last + 1), ordered=True)
+        elif name == "startMonth":
+            months = start.astype("datetime64[M]").astype(np.int64) % 12
+            values = pd.Categorical.from_codes(np.where(valid, months, -1), categories=MONTH_NAMES, ordered=True)
+        elif name == "startMonthDateTime":
+            values = start.astype("datetime64[M]").astype("datetime64[s]")
+        elif name == "startWeekday":
+            # 1970-01-01 was a Thursday (Monday = 0)
+            weekdays = (days.astype(np.int64) + 3) % 7
+            values = pd.Categorical.from_codes(np.where(valid, weekdays, -1), categories=DAY_NAMES, ordered=True)
+        elif name == "startHour":
+            values = pd.Categorical.from_codes(np.where(valid, seconds_of_day // 3600, -1),
+                                               categories=range(0, 25), ordered=True)
+        else:
+            raise KeyError(name)
+        return pd.Series(values, index=self.base.index, name=name)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        if name in self.base.columns:
+            return self.base[name]
+        return self._derive(name)
+
+    def to_frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Materialize the given (default: all) base and derived columns as a DataFrame."""
+        columns = columns or [c for c in self.columns if c != "durationSeconds"]
+        return pd.DataFrame({name: self[name] for name in columns}, index=self.base.index)
+
+    def copy(self, deep: bool = False) -> "CompactActivities":
+        return CompactActivities(self.base.copy(deep=deep))
+
+    def memory_usage_bytes(self) -> int:
+        return int(self.base.memory_usage(index=True, deep=True).sum())
+
+    def __repr__(self) -> str:
+        return (f"CompactActivities({len(self):,} activities, "
+                f"{self.memory_usage_bytes() / max(1, len(self)):.1f} bytes/activity)")
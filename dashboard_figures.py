@@ -0,0 +1,314 @@
+import json
+
+import marimo as mo
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import instrumentation
+
+
+@instrumentation.instrumented("figures/render_html", rows=None)
+def figure_html(fig: go.Figure) -> str:
+    """The HTML marimo renders for a Plotly figure."""
+    return mo.as_html(fig).text
+
+
+@instrumentation.instrumented("figures/render_json", rows=None)
+def figure_json(fig: go.Figure) -> str:
+    return fig.to_json()
+
+
+def figure_from_json(fig_json: str) -> go.Figure:
+    """Rebuild a figure serialized by figure_json."""
+    return go.Figure(json.loads(fig_json))
+
+
+def comparison_bar_trace(df_metric: pd.DataFrame, title, suffix=""):
+    return go.Bar(
+        y=df_metric["matchLabel"].astype(str),
+        x=df_metric["value"],
+        orientation="h",
+        textangle=0,
+        text=[f"{v:.0f}{(' ' + suffix) if suffix else ''}" for v in df_metric["value"]],
+        textposition="auto",
+        name=title,
+        showlegend=False,
+    )
+
+
+@instrumentation.instrumented("figures/build_bar", rows=None)
+def build_bar_fig(
+    df_metric: pd.DataFrame, title, suffix="",
+    category_order=None, *, width=None, height=150, margins=(70,16,20,16)
+):
+    fig = go.Figure()
+    fig.add_trace(comparison_bar_trace(df_metric, title, suffix))
+    if category_order is None:
+        category_order = df_metric["matchLabel"].astype(str).tolist()
+
+    l, r, t, b = margins
+    fig.update_layout(
+        title=None,
+        autosize=True,          # ← let Plotly compute size
+        width=width,            # ← None = no hard width
+        height=height,
+        margin=dict(l=l, r=r, t=t, b=b),
+    )
+    fig.update_yaxes(
+        type="category",
+        categoryorder="array",
+        categoryarray=category_order
+    )
+    # compact x-axis + prevent label clipping on small screens
+    fig.update_xaxes(ticks="outside", showgrid=True, griddash="dot", automargin=True)
+    return fig
+
+
+def gauge_trace(
+    latest_value, median_value, suffix="",
+    number_font_size=12, delta_font_size=10, rng=None,
+    tolerance_ratio=0.03
+):
+    v = float(latest_value) if pd.notna(latest_value) else 0.0
+    m = float(median_value) if pd.notna(median_value) else 0.0
+    upper = max(v, m, 1.0)
+    if rng is None:
+        rng = (0, upper * 1.2)
+
+    # --- softer motivational palette ---
+    color_below = "#E88B5A"   # warm clay/orange-rose
+    color_near  = "#B7C9A9"   # gentle sage
+    color_above = "#5CA793"   # uplifting teal-green
+
+    if m == 0:
+        bar_color = color_near
+    else:
+        diff_ratio = (v - m) / m
+        if abs(diff_ratio) <= tolerance_ratio:
+            bar_color = color_near
+        elif v > m:
+            bar_color = color_above
+        else:
+            bar_color = color_below
+
+    return go.Indicator(
+        mode="gauge+number+delta",
+        value=v,
+        delta=dict(
+            reference=m,
+            relative=False,
+            font={"size": delta_font_size},
+            increasing={"color": color_above},
+            decreasing={"color": color_below},
+        ),
+        title={"text": ""},
+        number={"suffix": f" {suffix}" if suffix else "", "font": {"size": number_font_size}},
+        gauge=dict(
+            axis={"range": [rng[0], rng[1]]},
+            bar={"thickness": 0.45, "color": bar_color},
+            threshold={"line": {"color": "#444", "width": 1.5}, "thickness": 0.9, "value": m}
+        ),
+        domain={"x": [0, 1], "y": [0, 1]},
+    )
+
+
+@instrumentation.instrumented("figures/build_gauge", rows=None)
+def build_gauge_fig(latest_value, median_value, title="", suffix="",
+        *, width=None, height=130, margins=(24, 32, 12, 12),
+        number_font_size=12, delta_font_size=10):
+    fig = go.Figure()
+    fig.add_trace(gauge_trace(latest_value, median_value, suffix, number_font_size, delta_font_size))
+    l, r, t, b = margins
+    fig.update_layout(
+        autosize=True,
+        width=width,            # ← None
+        height=height,
+        margin=dict(l=l, r=r, t=t, b=b),
+    )
+    return fig
+
+
+@instrumentation.instrumented("figures/build_subplots", rows=None)
+def build_dashboard_subplots_fig(cards, category_order, *, row_height=160, margins=(80, 18, 30, 16),
+                                 number_font_size=16, delta_font_size=12):
+    """
+    All gauge/bar card pairs as one figure: a row per card with the gauge on the
+    left and the comparison bars on the right, so the page carries one Plotly
+    spec and one plot instead of two per card.
+
+    cards: (title, latest_value, median_value, metric_df, suffix) tuples, with
+    metric_df shaped like the build_bar_fig input. Like the per-card gauges, the
+    gauges show the plain number; the suffix labels the bars.
+    """
+    fig = make_subplots(
+        rows=len(cards), cols=2,
+        specs=[[{"type": "indicator"}, {"type": "xy"}] for _ in cards],
+        column_widths=[0.28, 0.72],
+        horizontal_spacing=0.12,
+        vertical_spacing=0.3 / max(1, len(cards)),
+        subplot_titles=[text for (title, *_) in cards for text in (title, "")],
+    )
+    for row, (title, latest_value, median_value, metric_df, suffix) in enumerate(cards, start=1):
+        fig.add_trace(gauge_trace(latest_value, median_value, "", number_font_size, delta_font_size), row=row, col=1)
+        fig.add_trace(comparison_bar_trace(metric_df, title, suffix), row=row, col=2)
+        fig.update_yaxes(type="category", categoryorder="array", categoryarray=category_order, row=row, col=2)
+
+    fig.update_xaxes(ticks="outside", showgrid=True, griddash="dot", automargin=True)
+    fig.update_annotations(xanchor="left", x=0, font={"size": 14})
+    l, r, t, b = margins
+    fig.update_layout(
+        autosize=True,
+        height=row_height * len(cards),
+        margin=dict(l=l, r=r, t=t, b=b),
+        showlegend=False,
+    )
+    return fig
+
+
+def render_subplot_dashboard(fig_html, big_title="Last Four Weeks"):
+    return mo.md(f"""
+<style>
+  .dash-title {{
+    margin: 0 0 10px 0;
+    font-size: 1.4rem;
+    font-weight:600;
+    text-align:center;
+  }}
+</style>
+
+<p class="dash-title">{big_title}</p>
+
+{fig_html}
+""")
+
+
+def render_panel(title, gauge_html, bar_html):
+    return f"""
+    <div class="panel">
+      <div class="panel-title">{title}</div>
+      <div class="panel-gauge">{gauge_html}</div>
+      <div class="panel-bar">{bar_html}</div>
+    </div>
+    """
+
+
+def render_flex_dashboard(items, big_title="Last Four Weeks", gap_row=12):
+    cards_html = "\n".join(render_panel(t, g, b) for (t, g, b) in items)
+    return mo.md(f"""
+<style>
+  .dash-title {{
+    margin: 0 0 10px 0;
+    font-size: 1.4rem;
+    font-weight:600;
+    text-align:center;
+  }}
+  /* whole page stack of rows */
+  .flex-wrap-panels {{
+    display:flex;
+    flex-direction:column;     /* each card on its own row */
+    row-gap:{gap_row}px;
+  }}
+  /* a single row/card, laid out horizontally */
+  .panel {{
+    display:flex;
+    flex-direction:row;        /* Title -> Gauge -> Bar */
+    flex-wrap:wrap;
+    justify-content:center;
+    align-items:center;
+    gap:12px;
+    padding:8px 12px;
+    border:1px solid #ddd;
+    border-radius:10px;
+    box-shadow:0 1px 3px rgba(0,0,0,0.08);
+    background:#fff;
+    width:100%;
+  }}
+  .panel-title {{
+    width:110px;           /* give the title room */
+    font-size:0.95rem;
+    font-weight:600;
+    text-align:left;
+    white-space:nowrap;        /* keep on one line */
+  }}
+  /* Plotly figures define size; no CSS sizing here */
+  .panel-gauge {{ overflow:hidden; }}
+  .panel-bar {{ 
+      overflow:hidden; 
+      max-width:520px;
+   }}
+</style>
+
+<p class="dash-title">{big_title}</p>
+
+<div class="flex-wrap-panels">
+  {cards_html}
+</div>
+""")
+
+
+@instrumentation.instrumented("figures/build_monthly_heatmap", rows=None)
+def build_monthly_heatmap_fig(pivot: pd.DataFrame, start_year: int, end_year: int) -> go.Figure:
+    fig = px.imshow(
+        pivot,
+        color_continuous_scale=[
+            [0.0, "white"],     # 0 → white
+            [0.001, "#e0f3db"], # light mint
+            [0.25, "#a8ddb5"],  # soft teal
+            [0.5, "#43a2ca"],   # mid blue
+            [0.75, "#0868ac"],  # deep blue
+            [1.0, "#084081"]    # max intensity
+        ],
+        aspect="auto",
+        labels=dict(x="Month", y="Year", color="Distance (mi)"),
+        title=f"Monthly Distance ({start_year}–{end_year})",
+        zmin=0   # ensures 0 maps to white
+    )
+
+    fig.update_layout(
+        height=520,
+        margin=dict(l=50, r=20, t=60, b=40),
+        coloraxis_colorbar=dict(title="mi"),
+        xaxis_title=None,
+        yaxis_title=None,
+    )
+
+    fig.update_traces(
+        hovertemplate="Year %{y}<br>Month %{x}<br>Distance %{z:.1f} mi<extra></extra>"
+    )
+    return fig
+
+
+@instrumentation.instrumented("figures/build_training_load", rows=None)
+def build_training_load_fig(load: pd.DataFrame, metric: str = "distanceMiles", suffix: str = "mi",
+                            short: int = 7, long: int = 28) -> go.Figure:
+    """
+    Rolling load of one metric from TrainingLoad.frame(): the short and long
+    window sums as weekly rates, and their ratio on a second axis with the
+    usual 0.8-1.3 acute:chronic band shaded.
+    """
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    for window, color in ((short, "#0868ac"), (long, "#a8ddb5")):
+        fig.add_trace(go.Scatter(
+            x=load.index, y=load[f"{metric}{window}d"] * 7 / window, name=f"{window}-day ({suffix}/week)",
+            mode="lines", line=dict(color=color, width=2),
+            hovertemplate=f"%{{x|%Y-%m-%d}}<br>%{{y:.1f}} {suffix}/week<extra>{window}-day</extra>",
+        ), secondary_y=False)
+    fig.add_trace(go.Scatter(
+        x=load.index, y=load[f"{metric}Ratio{short}d{long}d"], name=f"{short}:{long} ratio",
+        mode="lines", line=dict(color="#e6550d", width=1.5, dash="dot"),
+        hovertemplate="%{x|%Y-%m-%d}<br>ratio %{y:.2f}<extra></extra>",
+    ), secondary_y=True)
+    fig.add_hrect(y0=0.8, y1=1.3, fillcolor="#e6550d", opacity=0.08, line_width=0, yref="y2")
+
+    fig.update_layout(
+        height=360,
+        margin=dict(l=50, r=50, t=60, b=40),
+        title=f"Training Load ({short}- vs {long}-day)",
+        legend=dict(orientation="h", yanchor="bottom", y=1.0, xanchor="right", x=1),
+        hovermode="x unified",
+    )
+    fig.update_yaxes(title_text=f"{suffix}/week", rangemode="tozero", secondary_y=False)
+    fig.update_yaxes(title_text="ratio", rangemode="tozero", showgrid=False, secondary_y=True)
+    return fig
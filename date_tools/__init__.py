@@ -0,0 +1,106 @@
+"""
+Date window helpers for the dashboard.
+
+The window functions here use only the standard library, so `import date_tools`
+does not load NumPy or pandas. The array (batch) versions live in
+date_tools.arrays (NumPy) and the DataFrame helpers in date_tools.frames
+(pandas); both are imported on first use of one of their names from this
+package, e.g. date_tools.filter_in_ranges.
+"""
+import importlib
+from datetime import date, timedelta
+
+import instrumentation
+
+# Names re-exported lazily from the submodules (PEP 562 module __getattr__)
+_LAZY_EXPORTS = {
+    "years_back_by_weekday_batch": "arrays",
+    "previous_weeks_batch": "arrays",
+    "previous_weeks_years_back_batch": "arrays",
+    "next_weeks_batch": "arrays",
+    "next_weeks_years_back_batch": "arrays",
+    "filter_in_ranges": "frames",
+    "summarize_previous_weeks_years_back": "frames",
+}
+# __getattr__ caches each export in the module dict, which importlib.reload keeps:
+# drop them so a reloaded package resolves them again from the (reloaded) submodules
+for _name in _LAZY_EXPORTS:
+    globals().pop(_name, None)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_EXPORTS])
+
+
+def years_back_by_weekday(reference_date: date, n_years: int) -> date:
+    """
+    Return the date that is n_years back on the same weekday.
+
+    >>> years_back_by_weekday(date(2024, 10, 15), 1)
+    datetime.date(2023, 10, 17)
+    >>> years_back_by_weekday(date(2025, 3, 1), 2)
+    datetime.date(2023, 3, 4)
+    """
+    return reference_date - timedelta(weeks=52 * n_years)
+
+
+def previous_weeks(reference_date: date, weeks_back: int = 1, years_back: int = 0) -> tuple[date, date]:
+    """
+    The same weekday-aligned weeks_back weeks, years_back years earlier (0 = this year).
+
+    >>> previous_weeks(date(2024, 10, 15))
+    (datetime.date(2024, 10, 9), datetime.date(2024, 10, 15))
+    >>> previous_weeks(date(2024, 10, 15), weeks_back=2)
+    (datetime.date(2024, 10, 2), datetime.date(2024, 10, 15))
+    >>> previous_weeks(date(2025, 3, 1), weeks_back=3, years_back=2)
+    (datetime.date(2023, 2, 12), datetime.date(2023, 3, 4))
+    """
+    end = years_back_by_weekday(reference_date, years_back)
+    start = end - timedelta(days=(6 + (7*max(0, weeks_back -1))))
+    return start, end
+
+
+@instrumentation.instrumented("date_tools/previous_weeks_years_back")
+def previous_weeks_years_back(reference_date: date, weeks_back: int = 1, years_back: int = 0) -> list[tuple[date, date]]:
+    """
+    The same weekday-aligned weeks_back weeks for years_back (0 = this year).
+
+    >>> previous_weeks_years_back(date(2024, 10, 15))
+    [(datetime.date(2024, 10, 9), datetime.date(2024, 10, 15))]
+    >>> previous_weeks_years_back(date(2024, 10, 15), 2, 2)
+    [(datetime.date(2024, 10, 2), datetime.date(2024, 10, 15)), (datetime.date(2023, 10, 4), datetime.date(2023, 10, 17)), (datetime.date(2022, 10, 5), datetime.date(2022, 10, 18))]
+    """
+    return [previous_weeks(reference_date, weeks_back, y) for y in range(0, years_back + 1)]
+
+
+def next_weeks(reference_date: date, weeks_forward: int = 1, years_back: int = 1) -> tuple[date, date]:
+    """
+    The weeks_forward weeks starting the day after the reference_date for years_back (1 = last year).
+
+    >>> next_weeks(date(2024, 10, 15))
+    (datetime.date(2023, 10, 18), datetime.date(2023, 10, 24))
+    >>> next_weeks(date(2024, 10, 15), weeks_forward=2)
+    (datetime.date(2023, 10, 18), datetime.date(2023, 10, 31))
+    """
+    start = years_back_by_weekday(reference_date + timedelta(days=1), years_back)
+    end = start + timedelta(days=6 + (max(0, weeks_forward - 1) * 7))
+    return start, end
+
+
+@instrumentation.instrumented("date_tools/next_weeks_years_back")
+def next_weeks_years_back(reference_date: date, weeks_forward: int = 1, years_back: int = 1) -> list[tuple[date, date]]:
+    """
+    The weeks_forward weeks starting the day after the reference_date for years_back (1 = last year).
+
+    >>> next_weeks_years_back(date(2024, 10, 15), weeks_forward=2, years_back=2)
+    [(datetime.date(2023, 10, 18), datetime.date(2023, 10, 31)), (datetime.date(2022, 10, 19), datetime.date(2022, 11, 1))]
+    """
+    return [next_weeks(reference_date, weeks_forward=weeks_forward, years_back=y) for y in range(1, years_back + 1)]
@@ -0,0 +1,86 @@
+"""
+Batch versions of the date_tools window helpers: reference dates (anything NumPy
+can cast to datetime64[D]: date objects, 'YYYY-MM-DD' strings, datetime64
+arrays) go in as an array, and datetime64[D] start/end arrays come out,
+computed in NumPy. Integer arguments broadcast against the reference dates.
+Results are equal to the scalar functions; pd.IntervalIndex.from_arrays(
+starts.ravel(), ends.ravel(), closed="both") turns a result into an IntervalIndex.
+"""
+from datetime import date
+
+import numpy as np
+
+import instrumentation
+
+
+def _as_days(reference_dates) -> np.ndarray:
+    return np.asarray(reference_dates, dtype="datetime64[D]")
+
+
+def years_back_by_weekday_batch(reference_dates, n_years) -> np.ndarray:
+    """
+    years_back_by_weekday for an array of reference dates (and/or n_years).
+
+    >>> years_back_by_weekday_batch([date(2024, 10, 15), date(2025, 3, 1)], [1, 2])
+    array(['2023-10-17', '2023-03-04'], dtype='datetime64[D]')
+    """
+    return _as_days(reference_dates) - (52 * 7 * np.asarray(n_years)).astype("timedelta64[D]")
+
+
+def previous_weeks_batch(reference_dates, weeks_back=1, years_back=0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    previous_weeks for an array of reference dates: (starts, ends).
+
+    >>> previous_weeks_batch([date(2024, 10, 15), date(2025, 3, 1)], weeks_back=[1, 3], years_back=[0, 2])
+    (array(['2024-10-09', '2023-02-12'], dtype='datetime64[D]'), array(['2024-10-15', '2023-03-04'], dtype='datetime64[D]'))
+    """
+    ends = years_back_by_weekday_batch(reference_dates, years_back)
+    starts = ends - (6 + 7 * np.maximum(0, np.asarray(weeks_back) - 1)).astype("timedelta64[D]")
+    return starts, ends
+
+
+@instrumentation.instrumented("date_tools/previous_weeks_years_back_batch", rows=lambda result: result[0].size)
+def previous_weeks_years_back_batch(reference_dates, weeks_back: int = 1,
+                                    years_back: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    previous_weeks_years_back for an array of reference dates: (starts, ends) of
+    shape (reference dates, years_back + 1), column y being y years back. A
+    single reference date gives one row.
+
+    >>> starts, ends = previous_weeks_years_back_batch(date(2024, 10, 15), 2, 2)
+    >>> starts
+    array([['2024-10-02', '2023-10-04', '2022-10-05']], dtype='datetime64[D]')
+    >>> ends
+    array([['2024-10-15', '2023-10-17', '2022-10-18']], dtype='datetime64[D]')
+    """
+    years = np.arange(0, years_back + 1)
+    return previous_weeks_batch(np.atleast_1d(_as_days(reference_dates))[:, None], weeks_back, years[None, :])
+
+
+def next_weeks_batch(reference_dates, weeks_forward=1, years_back=1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    next_weeks for an array of reference dates: (starts, ends).
+
+    >>> next_weeks_batch([date(2024, 10, 15), date(2024, 10, 15)], weeks_forward=[1, 2])
+    (array(['2023-10-18', '2023-10-18'], dtype='datetime64[D]'), array(['2023-10-24', '2023-10-31'], dtype='datetime64[D]'))
+    """
+    starts = years_back_by_weekday_batch(_as_days(reference_dates) + 1, years_back)
+    ends = starts + (6 + 7 * np.maximum(0, np.asarray(weeks_forward) - 1)).astype("timedelta64[D]")
+    return starts, ends
+
+
+@instrumentation.instrumented("date_tools/next_weeks_years_back_batch", rows=lambda result: result[0].size)
+def next_weeks_years_back_batch(reference_dates, weeks_forward: int = 1,
+                                years_back: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    next_weeks_years_back for an array of reference dates: (starts, ends) of
+    shape (reference dates, years_back), column y - 1 being y years back. A
+    single reference date gives one row.
+
+    >>> next_weeks_years_back_batch(["2024-10-15"], weeks_forward=2, years_back=2)
+    (array([['2023-10-18', '2022-10-19']], dtype='datetime64[D]'), array([['2023-10-31', '2022-11-01']], dtype='datetime64[D]'))
+    >>> next_weeks_years_back_batch(date(2024, 10, 15))[0]
+    array([['2023-10-18']], dtype='datetime64[D]')
+    """
+    years = np.arange(1, years_back + 1)
+    return next_weeks_batch(np.atleast_1d(_as_days(reference_dates))[:, None], weeks_forward, years[None, :])
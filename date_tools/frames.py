@@ -0,0 +1,233 @@
+"""DataFrame helpers of date_tools: matching rows to date ranges and per-window totals."""
+import heapq
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+import instrumentation
+
+
+def _first_match_interval(values, los: list, his: list) -> np.ndarray:
+    """
+    Index of the first [lo, hi] range containing each value (-1 if none).
+
+    The sorted unique bounds split the line into 2P+1 regions (P exact bound
+    points and the open gaps around them). Each range covers a contiguous run of
+    regions, so a heap sweep labels every region with its lowest covering range
+    and every value is then resolved with a single searchsorted.
+
+    >>> _first_match_interval(np.array([1, 3, 5, 9]), [2, 0, 4], [5, 3, 8]).tolist()
+    [1, 0, 0, -1]
+    """
+    points = np.unique(np.asarray(list(los) + list(his)))
+    n_regions = 2 * len(points) + 1
+
+    region_lo = 2 * np.searchsorted(points, np.asarray(los)) + 1
+    region_hi = 2 * np.searchsorted(points, np.asarray(his)) + 1
+    order = np.argsort(region_lo, kind="stable")
+
+    labels = np.full(n_regions, -1, dtype=np.int64)
+    active: list[int] = []
+    next_range = 0
+    for region in range(n_regions):
+        while next_range < len(order) and region_lo[order[next_range]] <= region:
+            heapq.heappush(active, int(order[next_range]))
+            next_range += 1
+        while active and region_hi[active[0]] < region:
+            heapq.heappop(active)
+        if active:
+            labels[region] = active[0]
+
+    values = np.asarray(values)
+    k = np.searchsorted(points, values, side="right")
+    exact = (k > 0) & (points[np.maximum(k - 1, 0)] == values)
+    region = np.where(exact, 2 * k - 1, 2 * k)
+    return labels[region]
+
+
+def _first_match_mask(s_cmp: pd.Series, ranges: list[list]) -> np.ndarray:
+    """
+    Index of the first range containing each value (-1 if none), computed from a
+    full rows x ranges boolean mask matrix.
+    """
+    masks = pd.concat(
+        [pd.Series(s_cmp.between(lo, hi, inclusive="both"), index=s_cmp.index)
+         for lo, hi in ranges],
+        axis=1
+    )
+    masks.columns = pd.RangeIndex(masks.shape[1])
+    any_match = masks.any(axis=1)
+    return np.where(any_match.to_numpy(), masks.idxmax(axis=1).to_numpy(), -1)
+
+
+def _to_datetime64_days(s: pd.Series) -> np.ndarray:
+    """
+    Normalize a datetime-like Series to a datetime64[D] array (wall-clock date for
+    tz-aware values, NaT for missing values).
+    """
+    if not is_datetime64_any_dtype(s):
+        s = pd.to_datetime(s)
+    if s.dt.tz is not None:
+        s = s.dt.tz_localize(None)
+    return s.to_numpy().astype("datetime64[D]")
+
+
+@instrumentation.instrumented("date_tools/filter_in_ranges")
+def filter_in_ranges(df: pd.DataFrame, column: str, ranges: list[list],
+                     engine: str = "interval", compare: str = "datetime64") -> pd.DataFrame:
+    """
+    Return rows where df[column] (compared at *date* precision) falls within any of the
+    given [start, end] ranges. The DataFrame column may be converted to dates/strings,
+    but the ranges are not converted (they are used and returned exactly as provided).
+
+    Supported range bound types:
+      - strings in 'YYYY-MM-DD' form
+      - datetime.date objects
+
+    The returned DataFrame includes 'matchStart' and 'matchEnd' columns containing the
+    first matched range (exact original values).
+
+    engine selects how rows are matched to ranges:
+      - 'interval' (default): sorted-bounds sweep + searchsorted, O((rows + ranges) log ranges)
+      - 'mask': one boolean column per range, O(rows x ranges) time and memory
+
+    compare selects the representation used for the comparison itself:
+      - 'datetime64' (default): the column and a copy of the bounds are normalized
+        to datetime64[D] once, so matching runs vectorized in NumPy
+      - 'object': the column is converted to Python date objects (or 'YYYY-MM-DD'
+        strings for string bounds) and compared with the bounds as given
+
+    >>> df = pd.DataFrame({"start": pd.to_datetime(["2024-10-01", "2024-10-10", "2023-10-05"])})
+    >>> filter_in_ranges(df, "start", [("2024-10-09", "2024-10-15"), ("2023-10-04", "2023-10-17")])
+           start matchStart   matchEnd
+    1 2024-10-10 2024-10-09 2024-10-15
+    2 2023-10-05 2023-10-04 2023-10-17
+    >>> filter_in_ranges(df, "start", [(date(2024, 9, 30), date(2024, 10, 1))], compare="object")
+           start matchStart   matchEnd
+    0 2024-10-01 2024-09-30 2024-10-01
+    """
+    s = df[column]
+
+    # --- Detect how ranges are represented (without converting them) ---
+    def bounds_are_str(rs):
+        return all(isinstance(v, str) for lo, hi in rs for v in (lo, hi))
+
+    def bounds_are_date(rs):
+        return all(isinstance(v, date) and not isinstance(v, datetime)
+                   for lo, hi in rs for v in (lo, hi))
+
+    los = [lo for lo, _ in ranges]
+    his = [hi for _, hi in ranges]
+
+    if not (bounds_are_str(ranges) or bounds_are_date(ranges)):
+        raise TypeError(
+            "Unsupported range bound types. Provide ranges as either "
+            "strings 'YYYY-MM-DD' or datetime.date objects. "
+            "(Ranges are not converted by this function.)"
+        )
+
+    if compare == "datetime64":
+        # Column and bounds share one datetime64[D] representation; the original
+        # bounds are still what ends up in matchStart/matchEnd
+        s_cmp = pd.Series(_to_datetime64_days(s), index=df.index)
+        los_cmp = np.array(los, dtype="datetime64[D]")
+        his_cmp = np.array(his, dtype="datetime64[D]")
+
+    elif compare == "object":
+        if bounds_are_str(ranges):
+            # Compare as strings 'YYYY-MM-DD' on the column side
+            # Convert the column to date first (if needed), then to the same string form
+            if is_datetime64_any_dtype(s):
+                s_cmp = s.dt.date.astype(str)
+            else:
+                # try to parse whatever is there to dates, then to 'YYYY-MM-DD'
+                s_cmp = pd.to_datetime(s).dt.date.astype(str)
+        else:
+            # Compare as date objects on the column side
+            if is_datetime64_any_dtype(s):
+                s_cmp = s.dt.date
+            else:
+                # try to parse to dates (column conversion is allowed)
+                s_cmp = pd.to_datetime(s).dt.date
+        los_cmp, his_cmp = los, his
+
+    else:
+        raise ValueError(f"Unknown compare {compare!r}; expected 'datetime64' or 'object'.")
+
+    if engine == "interval":
+        # Missing values (NaT -> None/'NaT') never match, same as `between`
+        valid = s.notna().to_numpy()
+        first_match_idx = np.full(len(s_cmp), -1, dtype=np.int64)
+        if len(ranges) and valid.any():
+            first_match_idx[valid] = _first_match_interval(s_cmp.to_numpy()[valid], los_cmp, his_cmp)
+    elif engine == "mask":
+        first_match_idx = _first_match_mask(s_cmp, list(zip(los_cmp, his_cmp)))
+    else:
+        raise ValueError(f"Unknown engine {engine!r}; expected 'interval' or 'mask'.")
+
+    any_match = first_match_idx >= 0
+    matched_idx = first_match_idx[any_match]
+
+    # Map the *original* (unconverted) bounds back into the result
+    out = df[any_match].copy()
+    out["matchStart"] = np.array(los, dtype=object)[matched_idx]
+    out["matchEnd"]   = np.array(his, dtype=object)[matched_idx]
+
+    out["matchStart"] = pd.to_datetime(out["matchStart"])
+    out["matchEnd"]   = pd.to_datetime(out["matchEnd"])
+    return out
+
+
+@instrumentation.instrumented("date_tools/summarize_previous_weeks_years_back")
+def summarize_previous_weeks_years_back(df: pd.DataFrame, column: str, reference_date: date,
+                                        weeks_back: int = 1, years_back: int = 0,
+                                        drop_empty: bool = False, **metrics: tuple[str, str]) -> pd.DataFrame:
+    """
+    Per-window totals for the previous_weeks_years_back windows, computed from
+    cumulative sums over the sorted df[column] dates (date precision) without
+    copying any matching rows.
+
+    metrics are named aggregations like DataFrame.groupby().agg():
+    name=(source column, 'sum' | 'count'). One row per window, in
+    previous_weeks_years_back order (this year first), with matchStart/matchEnd
+    as datetime64 like filter_in_ranges. A row counts towards every window
+    that contains it. drop_empty leaves out windows without any rows.
+
+    >>> df = pd.DataFrame({"start": pd.to_datetime(["2024-10-01", "2024-10-10", "2023-10-05"]),
+    ...                    "distanceMiles": [1.0, 2.0, 4.0]})
+    >>> summarize_previous_weeks_years_back(df, "start", date(2024, 10, 15), weeks_back=2, years_back=2,
+    ...     totalDistanceMiles=("distanceMiles", "sum"), totalActivities=("distanceMiles", "count"))
+      matchStart   matchEnd  totalDistanceMiles  totalActivities
+    0 2024-10-02 2024-10-15                 2.0                1
+    1 2023-10-04 2023-10-17                 4.0                1
+    2 2022-10-05 2022-10-18                 0.0                0
+    """
+    days = _to_datetime64_days(df[column])
+    valid = ~np.isnat(days)
+    order = None if valid.all() and (days[1:] >= days[:-1]).all() else np.argsort(days[valid], kind="stable")
+    sorted_days = days if order is None else days[valid][order]
+
+    # Window bounds exactly as previous_weeks: end steps back 52 weeks per year
+    ends = np.datetime64(reference_date, "D") - np.arange(years_back + 1) * 52 * 7
+    starts = ends - (6 + 7 * max(0, weeks_back - 1))
+    lo = np.searchsorted(sorted_days, starts, side="left")
+    hi = np.searchsorted(sorted_days, ends, side="right")
+
+    out = pd.DataFrame({"matchStart": starts.astype("datetime64[s]"), "matchEnd": ends.astype("datetime64[s]")})
+    for name, (source, how) in metrics.items():
+        values = df[source].to_numpy()
+        if how == "count":
+            values = pd.notna(values).astype(np.int64)
+        elif how == "sum":
+            values = np.nan_to_num(values.astype(np.float64))
+        else:
+            raise ValueError(f"Unsupported aggregation {how!r} for {name}; expected 'sum' or 'count'.")
+        values = values if order is None else values[valid][order]
+        cumulative = np.concatenate([np.zeros(1, dtype=values.dtype), np.cumsum(values)])
+        out[name] = cumulative[hi] - cumulative[lo]
+
+    if drop_empty:
+        out = out[hi > lo].reset_index(drop=True)
+    return out
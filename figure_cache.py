@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FIGURE_CACHE_SIZE = int(os.environ.get("FIGURE_CACHE_SIZE", 256))
+
+
+def _update_fingerprint(digest, obj) -> None:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(type(obj).__name__.encode())
+        digest.update(repr(obj.columns.tolist() if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        digest.update(repr(obj.dtypes.tolist() if isinstance(obj, pd.DataFrame) else obj.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.dtype, obj.shape)).encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for item in obj:
+            _update_fingerprint(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(f"dict[{len(obj)}]".encode())
+        for key in sorted(obj, key=repr):
+            _update_fingerprint(digest, key)
+            _update_fingerprint(digest, obj[key])
+    else:
+        digest.update(repr(obj).encode())
+
+
+def fingerprint(*parts) -> str:
+    """
+    Stable hash of figure inputs: DataFrames/Series by content (values, index,
+    columns, dtypes), arrays by bytes, containers recursively, anything else by repr.
+
+    >>> fingerprint(pd.DataFrame({"a": [1.0, 2.0]}), {"height": 150}) == fingerprint(pd.DataFrame({"a": [1.0, 2.0]}), {"height": 150})
+    True
+    >>> fingerprint(pd.DataFrame({"a": [1.0, 2.0]})) == fingerprint(pd.DataFrame({"a": [1.0, 2.5]}))
+    False
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        _update_fingerprint(digest, part)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Thread-safe LRU cache of serialized figures (HTML or JSON strings) keyed by
+    a fingerprint of the builder and its arguments. Shared by every session in
+    the process; at most max_entries serialized figures are kept.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: str, build: Callable[[], str]) -> str:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def figure(self, build_fig: Callable, *args, serialize: Callable, **kwargs) -> str:
+        """serialize(build_fig(*args, **kwargs)), built only if these inputs were not seen before."""
+        key = fingerprint(build_fig.__module__, build_fig.__qualname__, serialize.__qualname__, args, kwargs)
+        return self.get_or_build(key, lambda: serialize(build_fig(*args, **kwargs)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Dashboard inputs change at most daily, so one process-wide cache serves every session
+FIGURE_CACHE = FigureCache()
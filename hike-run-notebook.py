@@ -6,84 +6,97 @@ app = marimo.App(width="full", app_title="Hike-Run-Dash")
 
 @app.cell
 def _():
-    import requests
     import pandas as pd
-    from io import StringIO
-    import calendar
-
-    url = "https://data.cmiles.info/anonymousActivityData.json"
-    response = requests.get(url)
-    response.raise_for_status()
-
-    lines = pd.read_json(StringIO(response.text))
-    lines = lines.query('activityType == "On Foot"')
-
-    lines['folder'] = pd.Categorical(lines['folder'].astype(str))
-    lines['activityType'] = pd.Categorical(lines['activityType'])
-
-    lines['start'] = pd.to_datetime(lines['start'])
-    lines['end'] = pd.to_datetime(lines['end'])
-
-    startYearRange = range(lines['start'].min().year, lines['start'].max().year + 1)
-    lines['startYear'] = pd.Categorical(lines['start'].dt.year, categories=startYearRange, ordered=True)
-
-    lines['durationMinutes'] = (lines['end'].subtract(lines['start']).dt.total_seconds() / 60).round(0)
-
-    lines['startMonth'] = pd.Categorical(lines['start'].dt.month_name(), categories=list(calendar.month_name)[1:], ordered=True)
-    lines['startMonthDateTime'] = lines['start'].values.astype('datetime64[M]')
-    lines['startWeekday'] = pd.Categorical(lines['start'].dt.day_name(), categories=list(calendar.day_name), ordered=True)
-    lines['startHour'] = pd.Categorical(lines['start'].dt.hour, categories=range(0,25), ordered=True)
+    import activity_rollup
+    import instrumentation
+    import shared_data
+    import startup_timing
+
+    # Stage timings (PIPELINE_TRACE=1) are logged as `stage {...}` lines and shown in the
+    # Diagnostics section at the end
+
+    # Loaded once per server process and shared by every session: the feed comes from the
+    # local cache (ACTIVITY_CACHE_DIR / ACTIVITY_CACHE_TTL) and the incremental store
+    # (ACTIVITY_STORE_DIR, optional ACTIVITY_DELTA_PATH), and is reloaded in the background
+    # every ACTIVITY_REFRESH_SECONDS
+    with instrumentation.stage("notebook/load_data") as _stage:
+        activity = shared_data.get_activity_data()
+        lines = activity.session_lines()
+        _stage.rows = len(lines)
+    startup_timing.mark_once("data_ready")
+
+    # Daily prefix-sum cube that serves the window and monthly summaries below
+    rollup = activity.rollup
 
     lines
-    return lines, pd
+    return (
+        activity,
+        activity_rollup,
+        instrumentation,
+        lines,
+        pd,
+        rollup,
+        startup_timing,
+    )
 
 
 @app.cell
-def _(lines, pd):
+def _(activity_rollup, instrumentation, pd, rollup):
     import marimo as mo
     import date_tools as date_tools
     from datetime import date
     import importlib
+    import sys
 
-    importlib.reload(date_tools)
-
-    lastFourWeeksPreviousYears = date_tools.previous_weeks_years_back(date.today(), weeks_back = 4, years_back = 10)
+    # Pick up edits to date_tools (and its loaded submodules) while developing in
+    # `marimo edit`; app and script runs use the module as first imported
+    if mo.app_meta().mode == "edit":
+        for _name in [n for n in sys.modules if n.startswith("date_tools.")]:
+            importlib.reload(sys.modules[_name])
+        importlib.reload(date_tools)
 
-    linesLastFourWeeks = date_tools.filter_in_ranges(lines, 'start', lastFourWeeksPreviousYears)
+    with instrumentation.stage("notebook/four_week_summary") as _stage:
+        lastFourWeeksPreviousYears = date_tools.previous_weeks_years_back(date.today(), weeks_back = 4, years_back = 10)
 
-    summaryLastFourWeeks = linesLastFourWeeks.groupby('matchStart').agg(
-        totalDistanceMiles=('distanceMiles', 'sum'),
-        totalActivities=('folder', 'count'),
-        totalDurationMinutes=('durationMinutes', 'sum'),
-        totalClimbFeet=('climbFeet', 'sum')).reset_index()
+        # Same summary as the static bundle's summary.json (activity_rollup.window_summary)
+        summaryLastFourWeeks = activity_rollup.window_summary(rollup, lastFourWeeksPreviousYears).drop(columns=['matchEnd'])
 
-    summaryLastFourWeeks['totalDurationHours'] = (summaryLastFourWeeks['totalDurationMinutes'] / 60).round(0)
-    summaryLastFourWeeks['matchLabel'] = summaryLastFourWeeks['matchStart'].dt.date.astype(str)
+        summaryLastFourWeeks['totalDurationHours'] = (summaryLastFourWeeks['totalDurationMinutes'] / 60).round(0)
+        summaryLastFourWeeks['matchLabel'] = summaryLastFourWeeks['matchStart'].dt.date.astype(str)
 
-    med = summaryLastFourWeeks.median(numeric_only=True)
+        med = summaryLastFourWeeks.median(numeric_only=True)
 
-    summaryLastFourWeeksMedianRow = {
-        "matchStart": pd.NaT,
-        "totalDistanceMiles": med["totalDistanceMiles"],
-        "totalActivities": med["totalActivities"],
-        "totalDurationHours": med["totalDurationHours"],
-        "totalDurationMinutes": med["totalDurationMinutes"],
-        "totalClimbFeet": med["totalClimbFeet"],
-        "matchLabel": "10 Year Median",
-    }
+        summaryLastFourWeeksMedianRow = {
+            "matchStart": pd.NaT,
+            "totalDistanceMiles": med["totalDistanceMiles"],
+            "totalActivities": med["totalActivities"],
+            "totalDurationHours": med["totalDurationHours"],
+            "totalDurationMinutes": med["totalDurationMinutes"],
+            "totalClimbFeet": med["totalClimbFeet"],
+            "matchLabel": "10 Year Median",
+        }
 
-    summaryLastFourWeeksLatestRow = summaryLastFourWeeks.sort_values("matchStart", ascending=False).iloc[0]
+        summaryLastFourWeeksLatestRow = summaryLastFourWeeks.sort_values("matchStart", ascending=False).iloc[0]
 
-    summaryWithMedian = pd.concat(
-        [summaryLastFourWeeks, pd.DataFrame([summaryLastFourWeeksMedianRow])],
-        ignore_index=True
+        summaryWithMedian = pd.concat(
+            [summaryLastFourWeeks, pd.DataFrame([summaryLastFourWeeksMedianRow])],
+            ignore_index=True
+        )
+        _stage.rows = len(summaryLastFourWeeks)
+    return (
+        date,
+        lastFourWeeksPreviousYears,
+        mo,
+        summaryLastFourWeeks,
+        summaryWithMedian,
     )
-    return date, mo, summaryLastFourWeeks, summaryWithMedian
 
 
 @app.cell
-def _(mo, pd, summaryLastFourWeeks, summaryWithMedian):
-    import plotly.graph_objects as go
+def _(instrumentation, pd, startup_timing, summaryLastFourWeeks, summaryWithMedian):
+    import os
+    import dashboard_figures
+    from figure_cache import FIGURE_CACHE
 
     # --- Build comparison data: Median + latest 3 weeks ---
     median_only = summaryWithMedian.loc[summaryWithMedian["matchLabel"] == "10 Year Median"].copy()
@@ -97,289 +110,189 @@ def _(mo, pd, summaryLastFourWeeks, summaryWithMedian):
     def comparison_frame(metric_col: str) -> pd.DataFrame:
         return compare_rows.rename(columns={metric_col: "value"}).copy()
 
-    def comparison_bar_trace(df_metric: pd.DataFrame, title, suffix=""):
-        return go.Bar(
-            y=df_metric["matchLabel"].astype(str),
-            x=df_metric["value"],
-            orientation="h",
-            textangle=0,
-            text=[f"{v:.0f}{(' ' + suffix) if suffix else ''}" for v in df_metric["value"]],
-            textposition="auto",
-            name=title,
-            showlegend=False,
-        )
-
-    def build_bar_fig(
-        df_metric: pd.DataFrame, title, suffix="",
-        category_order=None, *, width=None, height=150, margins=(70,16,20,16)
-    ):
-        fig = go.Figure()
-        fig.add_trace(comparison_bar_trace(df_metric, title, suffix))
-        if category_order is None:
-            category_order = df_metric["matchLabel"].astype(str).tolist()
-
-        l, r, t, b = margins
-        fig.update_layout(
-            title=None,
-            autosize=True,          # ← let Plotly compute size
-            width=width,            # ← None = no hard width
-            height=height,
-            margin=dict(l=l, r=r, t=t, b=b),
-        )
-        fig.update_yaxes(
-            type="category",
-            categoryorder="array",
-            categoryarray=category_order
-        )
-        # compact x-axis + prevent label clipping on small screens
-        fig.update_xaxes(ticks="outside", showgrid=True, griddash="dot", automargin=True)
-        return fig
-
-    def gauge_trace(
-        latest_value, median_value, suffix="",
-        number_font_size=12, delta_font_size=10, rng=None,
-        tolerance_ratio=0.03
-    ):
-        v = float(latest_value) if pd.notna(latest_value) else 0.0
-        m = float(median_value) if pd.notna(median_value) else 0.0
-        upper = max(v, m, 1.0)
-        if rng is None:
-            rng = (0, upper * 1.2)
-
-        # --- softer motivational palette ---
-        color_below = "#E88B5A"   # warm clay/orange-rose
-        color_near  = "#B7C9A9"   # gentle sage
-        color_above = "#5CA793"   # uplifting teal-green
-
-        if m == 0:
-            bar_color = color_near
-        else:
-            diff_ratio = (v - m) / m
-            if abs(diff_ratio) <= tolerance_ratio:
-                bar_color = color_near
-            elif v > m:
-                bar_color = color_above
-            else:
-                bar_color = color_below
-
-        return go.Indicator(
-            mode="gauge+number+delta",
-            value=v,
-            delta=dict(
-                reference=m,
-                relative=False,
-                font={"size": delta_font_size},
-                increasing={"color": color_above},
-                decreasing={"color": color_below},
-            ),
-            title={"text": ""},
-            number={"suffix": f" {suffix}" if suffix else "", "font": {"size": number_font_size}},
-            gauge=dict(
-                axis={"range": [rng[0], rng[1]]},
-                bar={"thickness": 0.45, "color": bar_color},
-                threshold={"line": {"color": "#444", "width": 1.5}, "thickness": 0.9, "value": m}
-            ),
-            domain={"x": [0, 1], "y": [0, 1]},
-        )
-
-    def build_gauge_fig(latest_value, median_value, title="", suffix="",
-            *, width=None, height=130, margins=(24, 32, 12, 12),
-            number_font_size=12, delta_font_size=10):
-        fig = go.Figure()
-        fig.add_trace(gauge_trace(latest_value, median_value, suffix, number_font_size, delta_font_size))
-        l, r, t, b = margins
-        fig.update_layout(
-            autosize=True,
-            width=width,            # ← None
-            height=height,
-            margin=dict(l=l, r=r, t=t, b=b),
-        )
-        return fig
-
     latest = last3.iloc[0]
     med_vals = median_only.iloc[0]
 
     gauge_size = dict(width=160, height=150, margins=(22, 30, 12, 12), number_font_size=16, delta_font_size=12)
     bar_size   = dict(width=None, height=150, margins=(80, 18, 20, 16))
 
-    # Distance
-    dist_df = comparison_frame("totalDistanceMiles")
-    gauge_fig_dist = build_gauge_fig(latest["totalDistanceMiles"], med_vals["totalDistanceMiles"], "mi", **gauge_size)
-    bar_fig_dist   = build_bar_fig(dist_df, "Distance", "mi", category_order=category_order, **bar_size)
-
-    # Activities
-    act_df = comparison_frame("totalActivities")
-    gauge_fig_act = build_gauge_fig(latest["totalActivities"], med_vals["totalActivities"], "", **gauge_size)
-    bar_fig_act   = build_bar_fig(act_df, "Activities", "", category_order=category_order, **bar_size)
-
-    # Duration (convert minutes -> hours)
-    dur_df = comparison_frame("totalDurationMinutes").assign(value=lambda d: d["value"]/60.0)
-    gauge_fig_dur = build_gauge_fig(latest["totalDurationMinutes"]/60.0, med_vals["totalDurationMinutes"]/60.0, "h", **gauge_size)
-    bar_fig_dur   = build_bar_fig(dur_df, "Duration", "h", category_order=category_order, **bar_size)
-
-    # Climb
-    clm_df = comparison_frame("totalClimbFeet")
-    gauge_fig_clm = build_gauge_fig(latest["totalClimbFeet"], med_vals["totalClimbFeet"], "ft", **gauge_size)
-    bar_fig_clm   = build_bar_fig(clm_df, "Climb", "ft", category_order=category_order, **bar_size)
-
-    # --- Marimo render: each card is its own ROW + a single title above all rows ---
-    def render_panel(title, gauge_fig, bar_fig):
-        return f"""
-        <div class="panel">
-          <div class="panel-title">{title}</div>
-          <div class="panel-gauge">{mo.as_html(gauge_fig)}</div>
-          <div class="panel-bar">{mo.as_html(bar_fig)}</div>
-        </div>
-        """
-
-    def render_flex_dashboard(items, big_title="Last Four Weeks", gap_row=12):
-        cards_html = "\n".join(render_panel(t, g, b) for (t, g, b) in items)
-        return mo.md(f"""
-    <style>
-      .dash-title {{
-        margin: 0 0 10px 0;
-        font-size: 1.4rem;
-        font-weight:600;
-        text-align:center;
-      }}
-      /* whole page stack of rows */
-      .flex-wrap-panels {{
-        display:flex;
-        flex-direction:column;     /* each card on its own row */
-        row-gap:{gap_row}px;
-      }}
-      /* a single row/card, laid out horizontally */
-      .panel {{
-        display:flex;
-        flex-direction:row;        /* Title -> Gauge -> Bar */
-        flex-wrap:wrap;
-        justify-content:center;
-        align-items:center;
-        gap:12px;
-        padding:8px 12px;
-        border:1px solid #ddd;
-        border-radius:10px;
-        box-shadow:0 1px 3px rgba(0,0,0,0.08);
-        background:#fff;
-        width:100%;
-      }}
-      .panel-title {{
-        width:110px;           /* give the title room */
-        font-size:0.95rem;
-        font-weight:600;
-        text-align:left;
-        white-space:nowrap;        /* keep on one line */
-      }}
-      /* Plotly figures define size; no CSS sizing here */
-      .panel-gauge {{ overflow:hidden; }}
-      .panel-bar {{ 
-          overflow:hidden; 
-          max-width:520px;
-       }}
-    </style>
-
-    <p class="dash-title">{big_title}</p>
-
-    <div class="flex-wrap-panels">
-      {cards_html}
-    </div>
-    """)
-
-    items = [
-        ("Distance",  gauge_fig_dist, bar_fig_dist),
-        ("Activities", gauge_fig_act, bar_fig_act),
-        ("Duration",  gauge_fig_dur, bar_fig_dur),
-        ("Climb",     gauge_fig_clm, bar_fig_clm),
+    # Figures are served from the process-wide cache (keyed by their input data and
+    # layout) as rendered HTML, so repeat renders skip building and serializing them
+    def gauge_html(*args, **kwargs):
+        return FIGURE_CACHE.figure(dashboard_figures.build_gauge_fig, *args, serialize=dashboard_figures.figure_html, **kwargs)
+
+    def bar_html(*args, **kwargs):
+        return FIGURE_CACHE.figure(dashboard_figures.build_bar_fig, *args, serialize=dashboard_figures.figure_html, **kwargs)
+
+    # (title, latest, median, comparison frame, suffix); duration converted minutes -> hours
+    cards = [
+        ("Distance", latest["totalDistanceMiles"], med_vals["totalDistanceMiles"], comparison_frame("totalDistanceMiles"), "mi"),
+        ("Activities", latest["totalActivities"], med_vals["totalActivities"], comparison_frame("totalActivities"), ""),
+        ("Duration", latest["totalDurationMinutes"]/60.0, med_vals["totalDurationMinutes"]/60.0,
+         comparison_frame("totalDurationMinutes").assign(value=lambda d: d["value"]/60.0), "h"),
+        ("Climb", latest["totalClimbFeet"], med_vals["totalClimbFeet"], comparison_frame("totalClimbFeet"), "ft"),
     ]
 
-    render_flex_dashboard(items, big_title="Last Four Weeks vs. 10 Year Median")
-    return
+    with instrumentation.stage("notebook/dashboard_cards", rows=len(cards)):
+        # DASHBOARD_LAYOUT=subplots renders all cards as one multi-subplot figure (smaller page,
+        # one plot to paint); the default "panels" renders a gauge and a bar figure per card
+        if os.environ.get("DASHBOARD_LAYOUT", "panels") == "subplots":
+            dashboard = dashboard_figures.render_subplot_dashboard(
+                FIGURE_CACHE.figure(dashboard_figures.build_dashboard_subplots_fig, cards, category_order,
+                                    serialize=dashboard_figures.figure_html),
+                big_title="Last Four Weeks vs. 10 Year Median")
+        else:
+            # --- Marimo render: each card is its own ROW + a single title above all rows ---
+            items = [
+                (title, gauge_html(latest_value, median_value, suffix, **gauge_size),
+                 bar_html(metric_df, title, suffix, category_order=category_order, **bar_size))
+                for title, latest_value, median_value, metric_df, suffix in cards
+            ]
+            dashboard = dashboard_figures.render_flex_dashboard(items, big_title="Last Four Weeks vs. 10 Year Median")
 
+    # The first dashboard rendered in this process logs the startup report
+    startup_timing.log_report_once("first_render")
 
-@app.cell
-def _(date, lines, pd):
-    month_series_start_date = date(lines["start"].min().year + 1, 1, 1)
-    month_series_end_date = date(date.today().year, 12, 31)
+    dashboard
+    return FIGURE_CACHE, dashboard_figures, os
 
-    month_frame = pd.date_range(start=month_series_start_date, end=month_series_end_date, freq='MS')
 
-    month_data = pd.DataFrame(index=month_frame)
-    month_data = month_data.reset_index().rename(columns={"index": "month_date_time"})
-
-    month_grouped = lines.groupby(lines['startMonthDateTime']).agg(
-        totalDistanceMiles=('distanceMiles', 'sum'),
-        totalActivities=('folder', 'count'),
-        totalDurationMinutes=('durationMinutes', 'sum'),
-        totalClimbFeet=('climbFeet', 'sum')).reset_index()
+@app.cell
+def _(
+    FIGURE_CACHE,
+    activity,
+    activity_rollup,
+    dashboard_figures,
+    date,
+    instrumentation,
+    lines,
+    mo,
+    rollup,
+):
+    def build_monthly_pivot():
+        # Year (rows) × Month (cols) from the year after the first activity to this year, the same
+        # pivot as the static bundle's summary.json (activity_rollup.monthly_pivot)
+        start_year = lines["start"].min().year + 1
+        end_year = date.today().year
+        pivot = activity_rollup.monthly_pivot(rollup, start_year, end_year)
+
+        # Optional: if you prefer visible zeros instead of blank cells, uncomment:
+        # pivot = pivot.fillna(0)
+        return pivot, start_year, end_year
+
+    def monthly_heatmap():
+        with instrumentation.stage("notebook/monthly_heatmap"):
+            # Computed once per data snapshot (and year, which bounds the month range),
+            # then shared by every session until the next refresh
+            pivot, start_year, end_year = activity.memoized(("monthly_pivot", date.today().year), build_monthly_pivot)
+
+            # Built once per distinct pivot and kept as figure JSON in the process-wide cache
+            fig_json = FIGURE_CACHE.figure(dashboard_figures.build_monthly_heatmap_fig, pivot, start_year, end_year,
+                                           serialize=dashboard_figures.figure_json)
+            fig = dashboard_figures.figure_from_json(fig_json)
+
+            return mo.ui.plotly(fig)
+
+    return (monthly_heatmap,)
 
-    month_data = month_data.merge(
-        month_grouped,
-        left_on='month_date_time',
-        right_on='startMonthDateTime',
-        how='left'
-    ).drop(columns=['startMonthDateTime'])
 
-    month_data.columns
-    return (month_data,)
+@app.cell
+def _(mo, monthly_heatmap, os):
+    # By default the monthly view is only computed when its accordion is opened, so the
+    # first paint covers just the four-week cards; DASHBOARD_LAZY=0 renders it eagerly
+    if os.environ.get("DASHBOARD_LAZY", "1") == "0":
+        monthly_view = monthly_heatmap()
+    else:
+        monthly_view = mo.accordion({"Monthly Distance": mo.lazy(monthly_heatmap, show_loading_indicator=True)})
+
+    monthly_view
+    return
 
 
 @app.cell
-def _(mo, month_data, pd):
-    import plotly.express as px
-
-    # Ensure datetime type
-    month_data["month_date_time"] = pd.to_datetime(month_data["month_date_time"])
-
-    # Derive Year and Month labels for the grid
-    month_data["Year"] = month_data["month_date_time"].dt.year
-    month_data["MonthNum"] = month_data["month_date_time"].dt.month
-    month_data["Month"] = month_data["month_date_time"].dt.month_name().str[:3]
-
-    # Title years
-    start_year = int(month_data["Year"].min())
-    end_year = int(month_data["Year"].max())
-
-    # Pivot to Year (rows) × Month (cols)
-    month_order = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
-    pivot = (
-        month_data
-        .pivot_table(index="Year", columns="Month", values="totalDistanceMiles", aggfunc="sum")
-        .reindex(columns=month_order)             # consistent month order
-        .sort_index()                             # years ascending
-    )
+def _(
+    FIGURE_CACHE,
+    activity,
+    dashboard_figures,
+    date,
+    instrumentation,
+    mo,
+    os,
+    pd,
+    rollup,
+):
+    from training_load import TrainingLoad
+
+    def training_load_chart():
+        # Rolling 7/28/365-day sums for every day, built once per data snapshot from the
+        # daily rollup; the chart shows the last year up to today
+        def build_training_load():
+            load = TrainingLoad.from_rollup(rollup)
+            load.extend_to(date.today())
+            return load.frame(since=date.today() - pd.Timedelta(days=365).to_pytimedelta())
+
+        with instrumentation.stage("notebook/training_load"):
+            load_frame = activity.memoized(("training_load", date.today()), build_training_load)
+            fig_json = FIGURE_CACHE.figure(dashboard_figures.build_training_load_fig, load_frame,
+                                           serialize=dashboard_figures.figure_json)
+            return mo.ui.plotly(dashboard_figures.figure_from_json(fig_json))
+
+    # Like the monthly view: computed when opened unless DASHBOARD_LAZY=0
+    if os.environ.get("DASHBOARD_LAZY", "1") == "0":
+        training_load_view = training_load_chart()
+    else:
+        training_load_view = mo.accordion({"Training Load": mo.lazy(training_load_chart, show_loading_indicator=True)})
+
+    training_load_view
+    return
 
-    # Optional: if you prefer visible zeros instead of blank cells, uncomment:
-    # pivot = pivot.fillna(0)
-
-    fig = px.imshow(
-        pivot,
-        color_continuous_scale=[
-            [0.0, "white"],     # 0 → white
-            [0.001, "#e0f3db"], # light mint
-            [0.25, "#a8ddb5"],  # soft teal
-            [0.5, "#43a2ca"],   # mid blue
-            [0.75, "#0868ac"],  # deep blue
-            [1.0, "#084081"]    # max intensity
-        ],
-        aspect="auto",
-        labels=dict(x="Month", y="Year", color="Distance (mi)"),
-        title=f"Monthly Distance ({start_year}–{end_year})",
-        zmin=0   # ensures 0 maps to white
-    )
 
-    fig.update_layout(
-        height=520,
-        margin=dict(l=50, r=20, t=60, b=40),
-        coloraxis_colorbar=dict(title="mi"),
-        xaxis_title=None,
-        yaxis_title=None,
-    )
+@app.cell
+def _(activity_rollup, date, lastFourWeeksPreviousYears, mo, os):
+    # ACTIVITY_FEEDS="name=url,name=url,..." adds a team section: every feed is fetched and
+    # prepared concurrently (ACTIVITY_FEED_WORKERS) into one table partitioned by athlete,
+    # and the per-athlete summaries come from one rollup grouped by athlete
+    team_view = None
+    if os.environ.get("ACTIVITY_FEEDS"):
+        import team_data
+
+        team = team_data.get_team_data()
+        team_comparison = team_data.four_week_comparison(team.rollup, lastFourWeeksPreviousYears)
+        team_comparison.columns = [f"{metric} ({kind})" for metric, kind in team_comparison.columns]
+
+        def team_monthly_distance():
+            first_years = team.lines.groupby(team_data.ATHLETE_COLUMN, observed=True)["start"].min().dt.year + 1
+            pivots = team.memoized(("team_monthly_pivots", date.today().year),
+                                   lambda: activity_rollup.monthly_pivot(team.rollup, first_years, date.today().year))
+            return mo.ui.table(pivots.round(1).reset_index(), selection=None)
+
+        team_view = mo.vstack([
+            mo.md("## Team: Last Four Weeks vs. 10 Year Median"),
+            mo.ui.table(team_comparison.round(1).reset_index(), selection=None),
+            mo.accordion({"Team Monthly Distance": mo.lazy(team_monthly_distance, show_loading_indicator=True)}),
+        ])
+
+    team_view
+    return
 
-    fig.update_traces(
-        hovertemplate="Year %{y}<br>Month %{x}<br>Distance %{z:.1f} mi<extra></extra>"
-    )
 
-    mo.ui.plotly(fig)
+@app.cell
+def _(instrumentation, mo, pd):
+    # PIPELINE_TRACE=1: per-stage timings of this server process (all sessions), read when
+    # the section is opened, i.e. after the cells above have run
+    def diagnostics_view():
+        stages = pd.DataFrame(instrumentation.summary())
+        recent = pd.DataFrame(instrumentation.records()[-200:][::-1])
+        if stages.empty:
+            return mo.md("No stages recorded yet.")
+        return mo.vstack([
+            mo.md("**Per stage** (slowest total first)"),
+            mo.ui.table(stages, selection=None),
+            mo.md("**Most recent stages**"),
+            mo.ui.table(recent, selection=None),
+        ])
+
+    mo.accordion({"Diagnostics": mo.lazy(diagnostics_view)}) if instrumentation.enabled() else None
     return
 
 
@@ -0,0 +1,184 @@
+"""
+Stage timing for the data pipeline and dashboard.
+
+    with instrumentation.stage("notebook/four_weeks") as s:
+        summary = ...
+        s.rows = len(summary)
+
+    @instrumentation.instrumented("activity/prepare")
+    def prepare_activities(raw): ...
+
+While enabled (PIPELINE_TRACE=1, or set_enabled(True)), every stage records its
+duration, row count (set on the stage, or the len()/shape of a decorated
+function's result), resident memory delta and enclosing stage. Each record is
+kept in a bounded in-process buffer (see records() / summary()) and logged as
+one `stage {...}` JSON line on the "hike_run.stages" logger. While disabled,
+stage() returns a shared no-op context manager and instrumented functions make
+one flag check before calling through.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("hike_run.stages")
+
+MAX_RECORDS = int(os.environ.get("PIPELINE_TRACE_RECORDS", 2000))
+
+_enabled = os.environ.get("PIPELINE_TRACE", "0") == "1"
+_lock = threading.Lock()
+_records: deque = deque(maxlen=MAX_RECORDS)
+_local = threading.local()
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size (Linux /proc), None where unavailable."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = bool(value)
+
+
+def row_count(value) -> int | None:
+    """Rows of a DataFrame/Series/array (shape[0]) or len() of a sized value; None otherwise."""
+    shape = getattr(value, "shape", None)
+    if shape:
+        return int(shape[0])
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class _Stage:
+    __slots__ = ("name", "rows", "parent", "_t0", "_rss0")
+
+    def __init__(self, name: str, rows: int | None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self) -> "_Stage":
+        stack = _local.__dict__.setdefault("stack", [])
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._rss0 = _rss_bytes()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        seconds = time.perf_counter() - self._t0
+        rss = _rss_bytes()
+        _local.stack.pop()
+        record = {
+            "stage": self.name,
+            "seconds": round(seconds, 6),
+            "rows": self.rows,
+            "rss_delta_bytes": None if rss is None or self._rss0 is None else rss - self._rss0,
+            "parent": self.parent,
+            "thread": threading.current_thread().name,
+            "ok": exc_type is None,
+            "at": round(time.time(), 3),
+        }
+        with _lock:
+            _records.append(record)
+        logger.info("stage %s", json.dumps(record))
+
+
+class _NoStage:
+    """Stand-in returned while disabled; accepts rows like a real stage."""
+    __slots__ = ()
+    name = parent = None
+
+    def __enter__(self) -> "_NoStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def __setattr__(self, name, value) -> None:
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str, rows: int | None = None):
+    """Context manager timing the enclosed block as stage name (a no-op while disabled)."""
+    if not _enabled:
+        return _NO_STAGE
+    return _Stage(name, rows)
+
+
+def instrumented(name: str | None = None, rows=row_count):
+    """
+    Decorator running each call as a stage (default name: module.qualname);
+    rows(result) gives the row count (None to skip).
+
+    >>> @instrumented("demo/double")
+    ... def double(values):
+    ...     return [v * 2 for v in values]
+    >>> set_enabled(True); clear(); _ = double([1, 2, 3]); set_enabled(False)
+    >>> [(r["stage"], r["rows"]) for r in records()]
+    [('demo/double', 3)]
+    """
+    def decorate(fn):
+        stage_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(stage_name, None) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    s.rows = rows(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def records() -> list[dict]:
+    """The recorded stages, oldest first (at most MAX_RECORDS)."""
+    with _lock:
+        return list(_records)
+
+
+def clear() -> None:
+    with _lock:
+        _records.clear()
+
+
+def summary() -> list[dict]:
+    """Per stage: calls, total/mean/max seconds, last row count and summed RSS delta, slowest total first."""
+    stages: dict[str, dict] = {}
+    for r in records():
+        s = stages.setdefault(r["stage"], {"stage": r["stage"], "calls": 0, "total_s": 0.0, "max_s": 0.0,
+                                           "rows": None, "rss_delta_bytes": 0})
+        s["calls"] += 1
+        s["total_s"] += r["seconds"]
+        s["max_s"] = max(s["max_s"], r["seconds"])
+        s["rows"] = r["rows"] if r["rows"] is not None else s["rows"]
+        s["rss_delta_bytes"] += r["rss_delta_bytes"] or 0
+    for s in stages.values():
+        s["mean_s"] = s["total_s"] / s["calls"]
+    return sorted(stages.values(), key=lambda s: s["total_s"], reverse=True)
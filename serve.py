@@ -0,0 +1,80 @@
+"""
+Serve the dashboard like `marimo run --host 0.0.0.0 --port $PORT`, with a
+pre-warmed start: the activity data is fetched/loaded (and Plotly imported)
+in a background thread while the web server imports and starts, so the first
+session finds the shared snapshot ready. Sessions run as threads of this
+process, so they share what the prefetch loaded.
+
+A startup report (import seconds per module, seconds to server start, data
+ready and first render) is logged as one `startup {...}` JSON line.
+
+With STATIC_DIR set, the dashboard is also built as a static bundle (see
+static_export.py) after the data is ready and re-checked every
+STATIC_REBUILD_SECONDS; / serves the bundle with cache headers and the live
+notebook moves to /live/.
+"""
+import time
+
+START = time.perf_counter()
+
+import logging  # noqa: E402
+import os  # noqa: E402
+import threading  # noqa: E402
+
+import startup_timing  # noqa: E402
+
+startup_timing.set_process_start(START)
+
+NOTEBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hike-run-notebook.py")
+STATIC_DIR = os.environ.get("STATIC_DIR")
+logger = logging.getLogger("hike_run.startup")
+
+
+def prefetch() -> None:
+    try:
+        for name in ("numpy", "pandas", "requests", "activity_data", "shared_data"):
+            startup_timing.timed_import(name)
+        import shared_data
+        shared_data.get_activity_data()
+        startup_timing.mark_once("data_ready")
+    except Exception:
+        # The notebook retries the load (and shows the error) in the first session
+        logger.exception("activity data prefetch failed")
+    # Rendering imports, off the critical path: the first render doesn't pay for them
+    for name in ("plotly.graph_objects", "plotly.express", "dashboard_figures"):
+        startup_timing.timed_import(name)
+    startup_timing.mark_once("render_imports_ready")
+    if STATIC_DIR:
+        rebuild_static_bundle()
+
+
+def rebuild_static_bundle() -> None:
+    """Build the static bundle now and whenever its data key changes (checked periodically)."""
+    import static_export
+
+    while True:
+        try:
+            if static_export.build_static_bundle(STATIC_DIR):
+                logger.info("static bundle built in %s", STATIC_DIR)
+            startup_timing.mark_once("static_ready")
+        except Exception:
+            logger.exception("static bundle build failed")
+        time.sleep(static_export.DEFAULT_STATIC_REBUILD_SECONDS)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    threading.Thread(target=prefetch, name="prefetch", daemon=True).start()
+
+    marimo = startup_timing.timed_import("marimo")
+    uvicorn = startup_timing.timed_import("uvicorn")
+    server = marimo.create_asgi_app(include_code=False).with_app(path="/live" if STATIC_DIR else "", root=NOTEBOOK).build()
+    if STATIC_DIR:
+        import static_export
+        server = static_export.static_asgi_app(server, STATIC_DIR)
+    startup_timing.mark_once("server_ready")
+    uvicorn.run(server, host=os.environ.get("HOST", "0.0.0.0"), port=int(os.environ.get("PORT", 8080)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+import activity_data
+import activity_rollup
+import instrumentation
+from compact_activities import CompactActivities
+
+logger = logging.getLogger("hike_run.data")
+
+# ACTIVITY_PINNED_STORE: serve the store in this directory (activity_data.save_activity_store) as is,
+# without fetching the feed or refreshing; static_export hands its snapshot to the notebook export this way
+PINNED_STORE_DIR = os.environ.get("ACTIVITY_PINNED_STORE")
+DEFAULT_REFRESH_SECONDS = math.inf if PINNED_STORE_DIR else float(os.environ.get("ACTIVITY_REFRESH_SECONDS", 15 * 60))
+# First wait after a failed background reload; doubles per consecutive failure, up to refresh_seconds
+DEFAULT_RETRY_SECONDS = float(os.environ.get("ACTIVITY_REFRESH_RETRY_SECONDS", 60))
+# ACTIVITY_COMPACT=1 keeps lines as CompactActivities (base columns in small dtypes)
+COMPACT_LINES = os.environ.get("ACTIVITY_COMPACT", "0") == "1"
+
+
+@dataclass(frozen=True)
+class ActivitySnapshot:
+    """One loaded, prepared version of the activity data, shared read-only by all sessions."""
+    lines: pd.DataFrame | CompactActivities
+    rollup: activity_rollup.DailyRollup
+    loaded_at: float = field(default_factory=time.time)
+    _memo: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _memo_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def memoized(self, key: Hashable, compute: Callable[[], object]) -> object:
+        """
+        compute() once per key for the life of this snapshot (a refresh builds a
+        new snapshot and so starts empty). Concurrent callers for the same key
+        wait for the first computation.
+        """
+        with self._memo_lock:
+            entry = self._memo.setdefault(key, [threading.Lock(), None, False])
+        with entry[0]:
+            if not entry[2]:
+                entry[1], entry[2] = compute(), True
+        return entry[1]
+
+    def session_lines(self) -> pd.DataFrame | CompactActivities:
+        """
+        A per-session view of lines: a shallow copy, so columns are shared
+        zero-copy and (with pandas copy-on-write) any edit a session makes is
+        copied instead of leaking into other sessions.
+        """
+        return self.lines.copy(deep=False)
+
+
+@instrumentation.instrumented("activity/load_snapshot", rows=lambda snapshot: len(snapshot.lines))
+def load_activity_snapshot(compact: bool = COMPACT_LINES) -> ActivitySnapshot:
+    """Fetch (cached), load (incremental store) and roll up the activity feed, or load the pinned store."""
+    if PINNED_STORE_DIR:
+        lines, rollup = activity_data.load_incremental_activities(store_dir=PINNED_STORE_DIR)
+        if compact:
+            lines = CompactActivities.from_prepared(lines)
+        return ActivitySnapshot(lines, rollup)
+
+    activity_path = activity_data.fetch_activity_file(activity_data.ACTIVITY_URL)
+
+    delta_path = os.environ.get("ACTIVITY_DELTA_PATH")
+    delta_json = open(delta_path, encoding="utf-8").read() if delta_path and os.path.exists(delta_path) else None
+
+    # The store keeps the rollup up to date incrementally, so a refresh does not rebuild it from lines
+    lines, rollup = activity_data.load_incremental_activities(activity_path, delta_json)
+    if compact:
+        lines = CompactActivities.from_prepared(lines)
+    return ActivitySnapshot(lines, rollup)
+
+
+class SharedActivityData:
+    """
+    Process-wide holder of the current ActivitySnapshot. The first caller loads
+    it (concurrent first callers wait for that single load); later callers get
+    the same object. Once it is older than refresh_seconds, the next get()
+    starts a background reload and keeps returning the previous snapshot until
+    the new one is ready, so sessions never block on a refresh. A failed reload
+    is logged and keeps the previous snapshot; the next attempt waits
+    retry_seconds, doubling per consecutive failure up to refresh_seconds.
+    """
+
+    def __init__(self, loader: Callable[[], ActivitySnapshot] = load_activity_snapshot,
+                 refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+                 retry_seconds: float = DEFAULT_RETRY_SECONDS):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self._snapshot: ActivitySnapshot | None = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def get(self) -> ActivitySnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self.loader()
+                return self._snapshot
+        now = time.time()
+        if now - snapshot.loaded_at >= self.refresh_seconds and now >= self._retry_at:
+            self.refresh(wait=False)
+        return snapshot
+
+    def refresh(self, wait: bool = True) -> None:
+        """Reload now (wait=True) or in a background thread; only one reload runs at a time."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def reload():
+            try:
+                self._snapshot = self.loader()
+                self._failures = 0
+            except Exception:
+                if self._snapshot is None:
+                    raise
+                self._failures += 1
+                delay = min(self.refresh_seconds, self.retry_seconds * 2 ** (self._failures - 1))
+                self._retry_at = time.time() + delay
+                logger.exception("activity data reload failed (%d in a row), keeping the snapshot loaded at %s; "
+                                 "retrying in %.0f s", self._failures, time.ctime(self._snapshot.loaded_at), delay)
+            finally:
+                self._refreshing = False
+
+        if wait:
+            reload()
+        else:
+            threading.Thread(target=reload, name="activity-refresh", daemon=True).start()
+
+
+# In `marimo run` every browser session executes the notebook in the same server
+# process, so this module (and the snapshot it holds) is imported once and shared
+SHARED_ACTIVITY_DATA = SharedActivityData()
+
+
+def get_activity_data() -> ActivitySnapshot:
+    """The process-wide ActivitySnapshot (see SharedActivityData)."""
+    return SHARED_ACTIVITY_DATA.get()
@@ -0,0 +1,53 @@
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("hike_run.startup")
+
+# serve.py overrides this with its own start time; otherwise the first import of this module
+PROCESS_START = time.perf_counter()
+
+_lock = threading.Lock()
+_imports: dict[str, float] = {}
+_marks: dict[str, float] = {}
+_reported = False
+
+
+def set_process_start(start: float) -> None:
+    global PROCESS_START
+    PROCESS_START = start
+
+
+def timed_import(name: str):
+    """importlib.import_module(name), recording how long it took (0 if already imported)."""
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _imports.setdefault(name, time.perf_counter() - t0)
+    return module
+
+
+def mark_once(event: str) -> None:
+    """Record the first time event happens, as seconds since process start."""
+    with _lock:
+        _marks.setdefault(event, time.perf_counter() - PROCESS_START)
+
+
+def report() -> dict:
+    """Import seconds per module and seconds-since-start of each recorded event."""
+    with _lock:
+        return {"imports": dict(_imports), "events": dict(sorted(_marks.items(), key=lambda kv: kv[1]))}
+
+
+def log_report_once(event: str = "first_render") -> None:
+    """Mark event and, the first time this is called, log the startup report as one JSON line."""
+    global _reported
+    mark_once(event)
+    with _lock:
+        if _reported:
+            return
+        _reported = True
+    logger.info("startup %s", json.dumps({"pid": os.getpid(), **report()}))
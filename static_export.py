@@ -0,0 +1,215 @@
+"""
+Static build of the dashboard for high-traffic serving.
+
+Most visitors see the same dashboard for a given day, so instead of running a
+notebook session per visitor the pipeline runs once and the result is written
+to a bundle directory (STATIC_DIR):
+
+    index.html      the notebook exported as HTML (`marimo export html`, code
+                    hidden, lazy sections rendered eagerly) from the same
+                    loaded data as summary.json
+    summary.json    the four-week windows with the 10 year median, and the
+                    Year x Month distance pivot
+    manifest.json   data key, build time and row count
+
+The bundle is rebuilt only when its data key changes: the daily rollup, the
+day, the notebook source or the layout. serve.py serves it with cache headers
+when STATIC_DIR is set (static_asgi_app) and keeps the live notebook under
+/live/ for interactive use.
+
+    python static_export.py                  # build if the data changed
+    python static_export.py --force
+    python static_export.py --every 900      # keep rebuilding on a schedule
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+import activity_data
+import activity_rollup
+import date_tools
+import instrumentation
+import shared_data
+from compact_activities import CompactActivities
+from figure_cache import fingerprint
+
+NOTEBOOK = Path(__file__).resolve().parent / "hike-run-notebook.py"
+DEFAULT_STATIC_DIR = os.environ.get("STATIC_DIR", "static")
+DEFAULT_STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 300))
+DEFAULT_STATIC_REBUILD_SECONDS = float(os.environ.get("STATIC_REBUILD_SECONDS", 15 * 60))
+
+# Bundle files and their content types, as served by static_asgi_app
+BUNDLE_FILES = {
+    "index.html": "text/html; charset=utf-8",
+    "summary.json": "application/json",
+    "manifest.json": "application/json",
+}
+
+
+def data_key(snapshot: shared_data.ActivitySnapshot, today: date) -> str:
+    """What the exported dashboard depends on: daily totals, the day, the notebook and its layout."""
+    rollup = snapshot.rollup
+    return fingerprint(rollup.cumulative, str(rollup.first_day), today.isoformat(), NOTEBOOK.read_bytes(),
+                       os.environ.get("DASHBOARD_LAYOUT", "panels"))[:32]
+
+
+def dashboard_summary(snapshot: shared_data.ActivitySnapshot, today: date) -> dict:
+    """
+    The four-week windows (with median) and the monthly distance pivot, as
+    JSON-ready data; the notebook shows the same activity_rollup summaries.
+    """
+    ranges = date_tools.previous_weeks_years_back(today, weeks_back=4, years_back=10)
+    windows = activity_rollup.window_summary(snapshot.rollup, ranges)
+    metrics = [c for c in windows.columns if c.startswith("total")]
+    pivot = activity_rollup.monthly_pivot(snapshot.rollup, snapshot.lines["start"].min().year + 1, today.year)
+    return {
+        "date": today.isoformat(),
+        "fourWeeks": {
+            "windows": json.loads(windows.to_json(orient="records", date_format="iso")),
+            "median": {name: float(windows[name].median()) for name in metrics},
+        },
+        "monthlyDistance": {
+            "months": activity_rollup.MONTH_ORDER,
+            "years": {str(year): [None if pd.isna(v) else round(float(v), 2) for v in row]
+                      for year, row in pivot.iterrows()},
+        },
+    }
+
+
+def export_html(out: Path, snapshot: shared_data.ActivitySnapshot) -> None:
+    """
+    Export the notebook (code hidden, lazy sections rendered eagerly) to out.
+    `marimo export` runs it in a subprocess, which loads snapshot from a store
+    written next to out (ACTIVITY_PINNED_STORE): the page shows the same data
+    as summary.json and the data key, and the export neither fetches the feed
+    nor writes the shared cache and store while the server refreshes them. The
+    team section (ACTIVITY_FEEDS) is left out, it is not part of the data key.
+    """
+    store_dir = out.parent / "store"
+    lines = snapshot.lines.to_frame() if isinstance(snapshot.lines, CompactActivities) else snapshot.lines
+    activity_data.save_activity_store(store_dir, lines, snapshot.rollup)
+    env = {name: value for name, value in os.environ.items() if name != "ACTIVITY_FEEDS"}
+    env.update(DASHBOARD_LAZY="0", ACTIVITY_PINNED_STORE=str(store_dir))
+    subprocess.run([sys.executable, "-m", "marimo", "export", "html", "--no-include-code", str(NOTEBOOK),
+                    "-o", str(out), "-f"], cwd=NOTEBOOK.parent, env=env, check=True, capture_output=True)
+
+
+@instrumentation.instrumented("static/build", rows=None)
+def build_static_bundle(out_dir: str | os.PathLike = DEFAULT_STATIC_DIR, force: bool = False,
+                        snapshot: shared_data.ActivitySnapshot | None = None) -> bool:
+    """
+    Build the bundle in out_dir unless its manifest already has the current
+    data key (force rebuilds anyway). Files are written next to the bundle and
+    moved into place one by one, manifest.json last, so readers never see a
+    partial file. Returns whether it rebuilt.
+    """
+    out_dir = Path(out_dir)
+    snapshot = snapshot or shared_data.get_activity_data()
+    today = date.today()
+    key = data_key(snapshot, today)
+    try:
+        if not force and json.loads((out_dir / "manifest.json").read_text())["key"] == key:
+            return False
+    except (OSError, ValueError, KeyError):
+        pass
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=out_dir, prefix=".build-") as tmp:
+        tmp = Path(tmp)
+        (tmp / "summary.json").write_text(json.dumps(dashboard_summary(snapshot, today)), encoding="utf-8")
+        export_html(tmp / "index.html", snapshot)
+        manifest = {"key": key, "date": today.isoformat(), "built_at": time.time(), "rows": len(snapshot.lines)}
+        (tmp / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        for name in BUNDLE_FILES:
+            os.replace(tmp / name, out_dir / name)
+    return True
+
+
+class _Bundle:
+    """The current bundle files in memory, reloaded when manifest.json changes."""
+
+    def __init__(self, static_dir: Path):
+        self.static_dir = static_dir
+        self.mtime = None
+        self.files: dict[str, bytes] = {}
+        self.etag = None
+
+    def current(self) -> "_Bundle":
+        try:
+            mtime = (self.static_dir / "manifest.json").stat().st_mtime_ns
+        except OSError:
+            self.files, self.mtime = {}, None
+            return self
+        if mtime != self.mtime:
+            files = {name: (self.static_dir / name).read_bytes() for name in BUNDLE_FILES}
+            self.etag = '"' + json.loads(files["manifest.json"])["key"] + '"'
+            self.files, self.mtime = files, mtime
+        return self
+
+
+def static_asgi_app(live_app, static_dir: str | os.PathLike = DEFAULT_STATIC_DIR,
+                    max_age: int = DEFAULT_STATIC_MAX_AGE):
+    """
+    ASGI app serving the bundle at / (and /index.html, /summary.json,
+    /manifest.json) from memory with Cache-Control: public, max-age and an
+    ETag of the data key (If-None-Match gets a 304); everything else, e.g. the
+    live notebook under /live/, goes to live_app. Until the first bundle
+    exists, / redirects to /live/.
+    """
+    bundle = _Bundle(Path(static_dir))
+    routes = {"/": "index.html", **{f"/{name}": name for name in BUNDLE_FILES}}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in routes or scope["method"] not in ("GET", "HEAD"):
+            await live_app(scope, receive, send)
+            return
+
+        current = bundle.current()
+        if not current.files:
+            await send({"type": "http.response.start", "status": 307,
+                        "headers": [(b"location", b"/live/"), (b"cache-control", b"no-store")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        name = routes[scope["path"]]
+        headers = [(b"cache-control", f"public, max-age={max_age}".encode()), (b"etag", current.etag.encode())]
+        if dict(scope["headers"]).get(b"if-none-match", b"").decode() == current.etag:
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = current.files[name]
+        headers += [(b"content-type", BUNDLE_FILES[name].encode()), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DEFAULT_STATIC_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the data key is unchanged")
+    parser.add_argument("--every", type=float, help="keep running, checking for changes every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        built = build_static_bundle(args.out, force=args.force)
+        print(f"{'built' if built else 'unchanged'}: {Path(args.out).resolve()}", flush=True)
+        if not args.every:
+            break
+        time.sleep(args.every)
+        shared_data.SHARED_ACTIVITY_DATA.refresh(wait=True)
+        args.force = False
+
+
+if __name__ == "__main__":
+    main()
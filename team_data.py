@@ -0,0 +1,152 @@
+import logging
+import os
+import re
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+import activity_data
+import activity_rollup
+import instrumentation
+from shared_data import ActivitySnapshot, SharedActivityData
+
+logger = logging.getLogger("hike_run.team")
+
+ATHLETE_COLUMN = "athlete"
+DEFAULT_FEED_WORKERS = int(os.environ.get("ACTIVITY_FEED_WORKERS", 8))
+WINDOW_METRICS = [name for name, _ in activity_rollup.ROLLUP_METRICS]
+
+
+def parse_feeds(spec: str) -> dict[str, str]:
+    """
+    Athlete name -> feed URL from a spec like ACTIVITY_FEEDS
+    ('name=url' entries separated by commas or whitespace).
+
+    >>> parse_feeds("ana=https://example.com/a.json, ben=https://example.com/b.json")
+    {'ana': 'https://example.com/a.json', 'ben': 'https://example.com/b.json'}
+    """
+    feeds = {}
+    for entry in re.split(r"[,\s]+", spec.strip()):
+        if entry:
+            name, sep, url = entry.partition("=")
+            if not sep or not name or not url:
+                raise ValueError(f"feed entry {entry!r} is not name=url")
+            feeds[name] = url
+    return feeds
+
+
+def _cache_dir_name(athlete: str) -> str:
+    return re.sub(r"[^\w.-]", "_", athlete)
+
+
+def load_feed(athlete: str, url: str, cache_dir: str | os.PathLike = activity_data.DEFAULT_CACHE_DIR,
+              *, session: requests.Session | None = None) -> pd.DataFrame:
+    """
+    Prepared activity table of one athlete's feed: fetched into its own cache
+    directory (cache_dir/feeds/<athlete>, see fetch_activity_file) and loaded
+    through that directory's payload snapshot (write_snapshot keeps one per
+    directory, so each feed needs its own).
+    """
+    feed_dir = Path(cache_dir) / "feeds" / _cache_dir_name(athlete)
+    path = activity_data.fetch_activity_file(url, feed_dir, session=session)
+    return activity_data.load_prepared_activities(path, snapshot_dir=feed_dir / "snapshots")
+
+
+def concat_athletes(parts: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    One prepared table for many athletes: the per-athlete tables (athlete ->
+    prepared lines) with a leading categorical athlete column, partitioned by
+    athlete (in parts order) and sorted by start within each partition.
+    Categorical columns are aligned on the union of their categories.
+    """
+    frames = list(parts.values())
+    for name in (frames[0].columns if frames else []):
+        dtypes = [frame[name].dtype for frame in frames]
+        if not isinstance(dtypes[0], pd.CategoricalDtype) or all(d == dtypes[0] for d in dtypes):
+            continue
+        if name == "startYear":
+            years = [year for d in dtypes for year in d.categories]
+            categories = range(min(years), max(years) + 1)
+        else:
+            categories = sorted(set().union(*(d.categories for d in dtypes)))
+        dtype = pd.CategoricalDtype(categories, ordered=dtypes[0].ordered)
+        frames = [frame.astype({name: dtype}) for frame in frames]
+
+    team = pd.concat([frame.sort_values("start", kind="stable") for frame in frames], ignore_index=True)
+    athletes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    team.insert(0, ATHLETE_COLUMN, pd.Categorical.from_codes(athletes, categories=list(parts)))
+    return team
+
+
+@instrumentation.instrumented("team/load")
+def load_team_activities(feeds: Mapping[str, str], cache_dir: str | os.PathLike = activity_data.DEFAULT_CACHE_DIR,
+                         max_workers: int = DEFAULT_FEED_WORKERS,
+                         *, session: requests.Session | None = None) -> pd.DataFrame:
+    """
+    Fetch and prepare many feeds (athlete -> URL) concurrently on a thread pool
+    sharing one pooled HTTP session, and combine them with concat_athletes.
+    A feed that cannot be loaded (and has no cached copy) is logged and left
+    out; if none can be loaded the first error is raised.
+    """
+    if not feeds:
+        raise ValueError("no activity feeds given")
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feed") as pool:
+        futures = {athlete: pool.submit(load_feed, athlete, url, cache_dir, session=session)
+                   for athlete, url in feeds.items()}
+
+    parts, errors = {}, []
+    for athlete, future in futures.items():
+        try:
+            parts[athlete] = future.result()
+        except Exception as error:
+            logger.warning("feed for %s (%s) could not be loaded: %s", athlete, feeds[athlete], error)
+            errors.append(error)
+    if errors and not parts:
+        raise errors[0]
+    return concat_athletes(parts)
+
+
+def load_team_snapshot() -> ActivitySnapshot:
+    """The feeds listed in ACTIVITY_FEEDS, loaded and rolled up per athlete."""
+    lines = load_team_activities(parse_feeds(os.environ.get("ACTIVITY_FEEDS", "")))
+    return ActivitySnapshot(lines, activity_rollup.DailyRollup.from_lines(lines, by=ATHLETE_COLUMN))
+
+
+# Like SHARED_ACTIVITY_DATA: loaded once per server process and shared by every session
+SHARED_TEAM_DATA = SharedActivityData(loader=load_team_snapshot)
+
+
+def get_team_data() -> ActivitySnapshot:
+    """The process-wide team ActivitySnapshot (see SharedActivityData)."""
+    return SHARED_TEAM_DATA.get()
+
+
+@instrumentation.instrumented("team/four_week_comparison")
+def four_week_comparison(rollup: activity_rollup.DailyRollup, ranges: list) -> pd.DataFrame:
+    """
+    Per group (athlete) of a grouped rollup: the totals of the most recent
+    window in ranges that has activities next to the median over all such
+    windows (the per-athlete version of the dashboard's four-week cards, from
+    the same activity_rollup.window_summary).
+    Columns are (metric, 'latest' | 'median').
+    """
+    windows = activity_rollup.window_summary(rollup, ranges)
+    grouped = windows.groupby(rollup.group_name, observed=True, sort=False)
+    latest = windows.loc[grouped["matchStart"].idxmax()].set_index(rollup.group_name)
+    return (
+        pd.concat({"latest": latest[["matchStart", *WINDOW_METRICS]], "median": grouped[WINDOW_METRICS].median()},
+                  axis=1)
+        .swaplevel(axis=1)
+        .reindex(columns=["matchStart", *WINDOW_METRICS], level=0)
+    )
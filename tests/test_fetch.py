@@ -0,0 +1,120 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import activity_data
+
+
+class StubFeed:
+    """What the stub server serves, and the headers of every request it got."""
+
+    def __init__(self):
+        self.body = b'[{"start": "2024-10-01T08:00:00"}]'
+        self.etag = '"v1"'
+        self.last_modified = "Tue, 01 Oct 2024 08:00:00 GMT"
+        self.error_status = None
+        self.requests = []
+
+
+def stub_handler(feed: StubFeed):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            feed.requests.append(dict(self.headers))
+            if feed.error_status:
+                self.send_error(feed.error_status)
+                return
+            if self.headers.get("If-None-Match") == feed.etag:
+                self.send_response(304)
+                self.send_header("ETag", feed.etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(feed.body)))
+            self.send_header("ETag", feed.etag)
+            self.send_header("Last-Modified", feed.last_modified)
+            self.end_headers()
+            self.wfile.write(feed.body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub_server():
+    """A StubFeed served by a local ThreadingHTTPServer; stop() takes it offline."""
+    feed = StubFeed()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub_handler(feed))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    feed.url = f"http://127.0.0.1:{server.server_address[1]}/anonymousActivityData.json"
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+
+    feed.stop = stop
+    yield feed
+    if thread.is_alive():
+        stop()
+
+
+def cached_meta(cache_dir) -> dict:
+    return json.loads((cache_dir / "anonymousActivityData.meta.json").read_text())
+
+
+def test_fresh_copy_is_served_without_a_request(stub_server, tmp_path):
+    first = activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=60)
+    second = activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=60)
+    assert second == first
+    assert second.read_bytes() == stub_server.body
+    assert len(stub_server.requests) == 1
+
+
+def test_stale_copy_is_revalidated(stub_server, tmp_path):
+    path = activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0)
+    fetched_at = cached_meta(tmp_path)["fetched_at"]
+
+    assert activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0) == path
+    revalidation = stub_server.requests[-1]
+    assert revalidation["If-None-Match"] == stub_server.etag
+    assert revalidation["If-Modified-Since"] == stub_server.last_modified
+    # The 304 keeps the body and restarts the TTL
+    assert path.read_bytes() == stub_server.body
+    assert cached_meta(tmp_path)["fetched_at"] >= fetched_at
+    assert not list(tmp_path.glob("*.download"))
+
+
+def test_changed_etag_replaces_body_and_metadata(stub_server, tmp_path):
+    path = activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0)
+    old_key = activity_data.feed_key(path)
+
+    stub_server.body, stub_server.etag = b'[{"start": "2024-10-02T09:00:00"}]', '"v2"'
+    activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0)
+    meta = cached_meta(tmp_path)
+    assert path.read_bytes() == stub_server.body
+    assert meta["etag"] == '"v2"'
+    assert meta["sha256"] == hashlib.sha256(stub_server.body).hexdigest()
+    assert meta["size"] == len(stub_server.body)
+    assert activity_data.feed_key(path) != old_key
+
+
+@pytest.mark.parametrize("failure", ["server_error", "offline"])
+def test_failed_request_falls_back_to_the_cached_copy(stub_server, tmp_path, failure):
+    path = activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0)
+    if failure == "server_error":
+        stub_server.error_status = 503
+    else:
+        stub_server.stop()
+
+    assert activity_data.fetch_activity_file(stub_server.url, tmp_path, ttl_seconds=0, timeout=5) == path
+    assert path.read_bytes() == stub_server.body
+    # Without a cached copy the failure is raised
+    with pytest.raises(requests.RequestException):
+        activity_data.fetch_activity_file(stub_server.url, tmp_path / "empty", ttl_seconds=0, timeout=5)
@@ -0,0 +1,129 @@
+import json
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import activity_data
+import activity_rollup
+from synthetic import synthetic_activity_json
+
+
+@pytest.fixture
+def records():
+    """About 800 synthetic feed records, a couple of days apart, sorted by start."""
+    return json.loads(synthetic_activity_json(800, first_year=2020, last_year=2024, seed=4))
+
+
+def shifted(record: dict, days: float) -> dict:
+    """An On Foot copy of record moved by days."""
+    offset = pd.Timedelta(days=days)
+    return {**record, "activityType": "On Foot",
+            "start": (pd.Timestamp(record["start"]) + offset).isoformat(),
+            "end": (pd.Timestamp(record["end"]) + offset).isoformat()}
+
+
+def write_feed(path, feed_records: list[dict]):
+    path.write_text(json.dumps(feed_records, separators=(",", ":")), encoding="utf-8")
+    return path
+
+
+def full_rebuild(feed_records: list[dict]) -> tuple[pd.DataFrame, activity_rollup.DailyRollup]:
+    lines = activity_data.prepare_activities(pd.read_json(StringIO(json.dumps(feed_records))))
+    lines = lines.sort_values("start", kind="stable")
+    return lines, activity_rollup.DailyRollup.from_lines(lines)
+
+
+def assert_matches_full_rebuild(result, feed_records: list[dict]) -> None:
+    lines, rollup = result
+    expected_lines, expected_rollup = full_rebuild(feed_records)
+    # Merged categoricals keep the union of the categories seen, so only the values have to match
+    pd.testing.assert_frame_equal(lines.reset_index(drop=True), expected_lines.reset_index(drop=True),
+                                  check_categorical=False)
+
+    # The incremental rollup may end with empty days (e.g. after the last activity was removed)
+    n = expected_rollup.n_days
+    assert rollup.first_day == expected_rollup.first_day
+    np.testing.assert_allclose(rollup.cumulative[:n + 1], expected_rollup.cumulative)
+    np.testing.assert_allclose(rollup.cumulative[n:], np.broadcast_to(expected_rollup.cumulative[n],
+                                                                      rollup.cumulative[n:].shape))
+
+
+def test_removing_a_lone_trailing_activity(records, tmp_path):
+    # Nothing else starts within the overlap before it, so the merge replaces it with no rows at all
+    lone = shifted(records[-1], 30)
+    feed, store = tmp_path / "feed.json", tmp_path / "store"
+    activity_data.load_incremental_activities(write_feed(feed, [*records, lone]), store_dir=store)
+
+    result = activity_data.load_incremental_activities(write_feed(feed, records), store_dir=store)
+    assert_matches_full_rebuild(result, records)
+    # The store written by that refresh loads again (and as is)
+    assert_matches_full_rebuild(activity_data.load_incremental_activities(feed, store_dir=store), records)
+
+
+def test_delta_then_feed_that_catches_up(records, tmp_path):
+    # The delta holds one activity about 36 days past the stored ones; the feed records in between
+    # arrive later with the feed and must not be skipped by the overlap cutoff
+    stored, caught_up = records[:700], records[:760]
+    ahead = next(r for r in records[700:] if pd.Timestamp(r["start"]) - pd.Timestamp(stored[-1]["start"])
+                 >= pd.Timedelta(days=36))
+    delta_json = json.dumps([shifted(ahead, 0)])
+    feed, store = tmp_path / "feed.json", tmp_path / "store"
+    activity_data.load_incremental_activities(write_feed(feed, stored), store_dir=store)
+    assert_matches_full_rebuild(activity_data.load_incremental_activities(feed, delta_json, store_dir=store),
+                                [*stored, shifted(ahead, 0)])
+
+    caught_up = [shifted(r, 0) if r is ahead else r for r in caught_up]
+    result = activity_data.load_incremental_activities(write_feed(feed, caught_up), delta_json, store_dir=store)
+    assert_matches_full_rebuild(result, caught_up)
+
+
+def test_delta_rows_newer_than_the_feed_are_kept(records, tmp_path):
+    stored, ahead = records[:700], shifted(records[-1], 30)
+    delta_json = json.dumps([ahead])
+    feed, store = tmp_path / "feed.json", tmp_path / "store"
+    activity_data.load_incremental_activities(write_feed(feed, stored), delta_json, store_dir=store)
+
+    result = activity_data.load_incremental_activities(write_feed(feed, records[:710]), delta_json, store_dir=store)
+    assert_matches_full_rebuild(result, [*records[:710], ahead])
+
+
+@pytest.mark.parametrize("backfill", [False, True], ids=["appended", "backfilled"])
+def test_appended_records(records, tmp_path, backfill):
+    stored, appended = records[:700], records[700:]
+    if backfill:
+        # A record appended at the end of the feed that starts years before the newest stored one
+        appended = [*appended, shifted(records[100], 1)]
+    feed, store = tmp_path / "feed.json", tmp_path / "store"
+    activity_data.load_incremental_activities(write_feed(feed, stored), store_dir=store)
+
+    result = activity_data.load_incremental_activities(write_feed(feed, [*stored, *appended]), store_dir=store)
+    assert_matches_full_rebuild(result, [*stored, *appended])
+    # Only the appended records were decoded (the store kept the byte prefix of the feed)
+    assert json.loads((store / "store.json").read_text())["source_prefix"]["bytes"] > 0
+
+
+@pytest.mark.parametrize("change", ["edit", "delete"])
+def test_change_inside_the_overlap(records, tmp_path, change):
+    last_start = pd.Timestamp(records[-1]["start"])
+    recent = [i for i, r in enumerate(records)
+              if last_start - pd.Timestamp(r["start"]) < activity_data.DEFAULT_REFRESH_OVERLAP / 2]
+    assert len(recent) >= 2
+    feed, store = tmp_path / "feed.json", tmp_path / "store"
+    activity_data.load_incremental_activities(write_feed(feed, records), store_dir=store)
+
+    changed = list(records)
+    for i in recent[:2]:
+        changed[i] = {**shifted(records[i], 0), "distanceMiles": records[i]["distanceMiles"] + 1.5}
+    if change == "delete":
+        del changed[recent[0]]
+    result = activity_data.load_incremental_activities(write_feed(feed, changed), store_dir=store)
+    assert_matches_full_rebuild(result, changed)
+
+
+def test_text_feed_matches_full_rebuild(records, tmp_path):
+    store = tmp_path / "store"
+    activity_data.load_incremental_activities(json.dumps(records[:700]), store_dir=store)
+    result = activity_data.load_incremental_activities(json.dumps(records), store_dir=store)
+    assert_matches_full_rebuild(result, records)
@@ -0,0 +1,82 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pandas as pd
+import pytest
+
+import activity_data
+import instrumentation
+import team_data
+from synthetic import synthetic_activity_json
+
+ATHLETES = {"ana": 0, "ben": 1, "cy": 2}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server(tmp_path):
+    """Synthetic feeds (one per athlete, different sizes and years) served from a local ThreadingHTTPServer."""
+    feed_dir = tmp_path / "served"
+    feed_dir.mkdir()
+    texts = {}
+    for athlete, seed in ATHLETES.items():
+        texts[athlete] = synthetic_activity_json(500 + 300 * seed, first_year=2015 + seed, last_year=2024, seed=seed)
+        (feed_dir / f"{athlete}.json").write_text(texts[athlete], encoding="utf-8")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(feed_dir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield {athlete: f"{base}/{athlete}.json" for athlete in ATHLETES}, texts
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def traced():
+    instrumentation.set_enabled(True)
+    instrumentation.clear()
+    yield
+    instrumentation.set_enabled(False)
+    instrumentation.clear()
+
+
+def stage_calls(name: str) -> int:
+    return sum(1 for record in instrumentation.records() if record["stage"] == name)
+
+
+def test_load_team_activities_matches_per_athlete_tables(feed_server, tmp_path):
+    feeds, texts = feed_server
+    team = team_data.load_team_activities(feeds, tmp_path / "cache", max_workers=3)
+
+    expected = team_data.concat_athletes({
+        athlete: activity_data.prepare_activities(pd.read_json(StringIO(text))) for athlete, text in texts.items()})
+    pd.testing.assert_frame_equal(team, expected)
+    assert team[team_data.ATHLETE_COLUMN].cat.categories.tolist() == list(ATHLETES)
+
+
+def test_warm_restart_reuses_every_feed_snapshot(feed_server, tmp_path, traced):
+    feeds, _ = feed_server
+    cold = team_data.load_team_activities(feeds, tmp_path / "cache", max_workers=3)
+    assert stage_calls("activity/prepare") == len(feeds)
+
+    instrumentation.clear()
+    warm = team_data.load_team_activities(feeds, tmp_path / "cache", max_workers=3)
+    assert stage_calls("activity/prepare") == 0
+    pd.testing.assert_frame_equal(warm, cold)
+    for athlete in feeds:
+        snapshots = list((tmp_path / "cache" / "feeds" / athlete / "snapshots").iterdir())
+        assert len(snapshots) == 1
+
+
+def test_unavailable_feed_is_left_out(feed_server, tmp_path):
+    feeds, _ = feed_server
+    feeds = {**feeds, "dee": feeds["ana"].replace("ana.json", "missing.json")}
+    team = team_data.load_team_activities(feeds, tmp_path / "cache", max_workers=4)
+    assert team[team_data.ATHLETE_COLUMN].cat.categories.tolist() == list(ATHLETES)
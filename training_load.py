@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+import activity_rollup
+import instrumentation
+
+# Rolling window lengths in days, shortest (acute) to longest
+LOAD_WINDOWS = (7, 28, 365)
+LOAD_METRICS = ("distanceMiles", "durationMinutes", "climbFeet")
+
+
+class TrainingLoad:
+    """
+    Rolling training-load sums (7/28/365 days by default) of distance, duration
+    and climb for every day of the history, with acute:chronic style ratios.
+
+    The daily totals are kept with their prefix sums, so every rolling window of
+    every day comes from one linear pass (two lookups per day and window), and
+    append_day extends the history by a day in amortized constant time instead
+    of rebuilding it. Windows are trailing and include their day; early in the
+    history they cover only the days that exist.
+
+    Ratios compare per-day averages of consecutive windows,
+    (sum over short / short) / (sum over long / long), e.g. the classic
+    acute:chronic workload ratio for 7 vs 28 days; NaN when the long window is
+    empty.
+
+    >>> lines = pd.DataFrame({
+    ...     "start": pd.to_datetime(["2024-10-01 08:00", "2024-10-05 09:00", "2024-10-09 07:00"]),
+    ...     "distanceMiles": [3.0, 5.0, 4.0], "durationMinutes": [60.0, 90.0, 70.0], "climbFeet": [100, 300, 200]})
+    >>> load = TrainingLoad.from_lines(lines, windows=(7, 28))
+    >>> load.frame()[["distanceMiles7d", "distanceMiles28d", "distanceMilesRatio7d28d"]].tail(3)
+                distanceMiles7d  distanceMiles28d  distanceMilesRatio7d28d
+    day                                                                   
+    2024-10-07              8.0               8.0                      4.0
+    2024-10-08              5.0               8.0                      2.5
+    2024-10-09              9.0              12.0                      3.0
+    >>> load.append_day("2024-10-11", [6.0, 50.0, 100.0])
+    >>> load.frame()["distanceMiles7d"].tail(2).tolist()
+    [9.0, 15.0]
+    """
+
+    def __init__(self, first_day, daily: np.ndarray, windows: tuple[int, ...] = LOAD_WINDOWS,
+                 metrics: tuple[str, ...] = LOAD_METRICS):
+        self.first_day = np.datetime64(first_day, "D")
+        self.windows = tuple(windows)
+        self.metrics = tuple(metrics)
+        self.n_days = len(daily)
+        # Growable buffers: _cumulative[i] = totals of the days before first_day + i
+        self._daily = np.zeros((max(1, self.n_days), len(self.metrics)))
+        self._daily[:self.n_days] = daily
+        self._cumulative = np.zeros((len(self._daily) + 1, len(self.metrics)))
+        np.cumsum(self._daily, axis=0, out=self._cumulative[1:])
+
+    @classmethod
+    def from_rollup(cls, rollup: activity_rollup.DailyRollup, windows: tuple[int, ...] = LOAD_WINDOWS) -> "TrainingLoad":
+        """Daily totals taken from a DailyRollup (summed over its groups, if any)."""
+        columns = [column for _, column in activity_rollup.ROLLUP_METRICS]
+        cumulative = rollup.cumulative.sum(axis=1)[:, [columns.index(metric) for metric in LOAD_METRICS]]
+        return cls(rollup.first_day, np.diff(cumulative, axis=0), windows)
+
+    @classmethod
+    def from_lines(cls, lines: pd.DataFrame, windows: tuple[int, ...] = LOAD_WINDOWS,
+                   start_column: str = "start") -> "TrainingLoad":
+        """Daily totals of a prepared activity table, by the day of each activity's start."""
+        return cls.from_rollup(activity_rollup.DailyRollup.from_lines(lines, start_column=start_column), windows)
+
+    @property
+    def last_day(self) -> np.datetime64:
+        return self.first_day + (self.n_days - 1)
+
+    def append_day(self, day, totals) -> None:
+        """
+        Add a day's totals (in metrics order) to the history. day may be the last
+        day (its totals are added to it) or any later day (days in between get
+        zeros); earlier days need a rebuild.
+        """
+        offset = int((np.datetime64(day, "D") - self.first_day).astype(np.int64))
+        if offset < self.n_days - 1:
+            raise ValueError(f"{day} is before the last day of the history ({self.last_day})")
+        if offset >= len(self._daily):
+            capacity = max(offset + 1, 2 * len(self._daily))
+            self._daily = np.concatenate([self._daily, np.zeros((capacity - len(self._daily), len(self.metrics)))])
+            self._cumulative = np.concatenate(
+                [self._cumulative, np.zeros((capacity + 1 - len(self._cumulative), len(self.metrics)))])
+        # Days between the old last day and day have no activities: carry the running total forward
+        self._cumulative[self.n_days + 1:offset + 1] = self._cumulative[self.n_days]
+        self._daily[offset] += np.asarray(totals, dtype=np.float64)
+        self._cumulative[offset + 1] = self._cumulative[offset] + self._daily[offset]
+        self.n_days = offset + 1
+
+    def extend_to(self, day) -> None:
+        """Extend the history with empty days up to day (no-op if it already reaches it)."""
+        if np.datetime64(day, "D") > self.last_day:
+            self.append_day(day, np.zeros(len(self.metrics)))
+
+    def rolling_sums(self) -> np.ndarray:
+        """Trailing window sums, shape (days, windows, metrics)."""
+        cumulative = self._cumulative[:self.n_days + 1]
+        hi = np.arange(1, self.n_days + 1)
+        return np.stack([cumulative[hi] - cumulative[np.maximum(hi - window, 0)] for window in self.windows], axis=1)
+
+    @instrumentation.instrumented("training_load/frame")
+    def frame(self, since=None) -> pd.DataFrame:
+        """
+        One row per day (from since, default the first day): <metric><window>d
+        rolling sums and <metric>Ratio<short>d<long>d ratios of consecutive windows.
+        """
+        sums = self.rolling_sums()
+        days = self.first_day + np.arange(self.n_days)
+        if since is not None:
+            keep = days >= np.datetime64(since, "D")
+            sums, days = sums[keep], days[keep]
+
+        data = {}
+        for m, metric in enumerate(self.metrics):
+            for w, window in enumerate(self.windows):
+                data[f"{metric}{window}d"] = sums[:, w, m]
+            for w, (short, long) in enumerate(zip(self.windows, self.windows[1:])):
+                long_sums = sums[:, w + 1, m]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    ratio = (sums[:, w, m] / short) / (long_sums / long)
+                data[f"{metric}Ratio{short}d{long}d"] = np.where(long_sums > 0, ratio, np.nan)
+        return pd.DataFrame(data, index=pd.DatetimeIndex(days.astype("datetime64[s]"), name="day"))